@@ -13,15 +13,23 @@ Output: Slack war-room message posted + slack_message_id → DynamoDB
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import re
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
-import boto3
+import orjson
 
-from backend.models.incident import append_action_log, get_incident, update_incident
+from backend.integrations.aws import bedrock_runtime, get_secret
+from backend.integrations.bedrock import stream_nova
+from backend.integrations.http_pool import HTTP
+from backend.models.incident import (
+    action_log_entry,
+    append_action_log,
+    get_incident,
+    update_and_append,
+    update_incident,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,39 +37,101 @@ NOVA_LITE_MODEL = "us.amazon.nova-lite-v1:0"
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 SLACK_CHANNEL = os.environ.get("SLACK_CHANNEL", "#incidents")
 
+# Shared across incidents — runs the Nova call while the agent does its other I/O
+_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="communication")
 
-def run_communication(incident_id: str) -> dict:
-    """Main entry point for Communication Agent."""
+# Last-resort user impact by severity (non-round so it reads as inferred)
+SEVERITY_BASE_USERS = {
+    "HIGH": 8743,
+    "MED": 2156,
+    "LOW": 341,
+}
+
+# Slack post-processing — Nova usually follows the formatting rules, so the
+# JSON-blob strip is guarded by a substring check before the regex engine runs
+_REASON_BLOB_RE = re.compile(r'\{["\']reason["\'].*?\}', re.DOTALL)
+
+# ─── Static prompt prefix ─────────────────────────────────────────────────────
+# Everything here is identical for every incident, so it is sent ahead of the
+# incident details and cached by Bedrock (see backend.integrations.bedrock).
+
+SYSTEM_PROMPT = """You are an SRE bot generating a production incident war-room brief for Slack.
+Write in a clear, urgent, professional tone. Be concise — engineers are under pressure.
+
+CRITICAL SLACK FORMATTING RULES:
+- Bold text: *single asterisks* — NEVER use **double asterisks**
+- Code: `backticks`
+- NEVER use ## markdown headers — use *SECTION TITLE:* style instead
+- Bullet points: use -
+
+Respond with ONLY the Slack message text, nothing else."""
+
+BRIEF_INSTRUCTIONS = """Generate a Slack war-room brief for the incident described below.
+
+The message MUST include:
+1. A severity header with emoji (🔴 HIGH / 🟡 MED / 🟢 LOW)
+2. Repo + blast radius
+3. Estimated user impact (~N users, using ESTIMATED USERS AFFECTED)
+4. Triggering commit hash and author
+5. Specific issue found — cite the actual lines and what they do wrong
+6. First action step from runbook (if available)
+7. 2-3 immediate action items
+8. "Reply to this thread with updates."
+
+Keep it under 300 words. Make it scannable. Do NOT output raw JSON anywhere."""
+
+# Per-incident part of the prompt — the only text that changes between calls
+INCIDENT_DETAILS_TEMPLATE = """INCIDENT ID: {incident_id}
+REPO: {repo_id}
+SEVERITY: {severity}
+BLAST RADIUS: {blast_radius}
+ESTIMATED USERS AFFECTED: ~{estimated_users:,}
+TRIAGE SUMMARY: {triage_summary}{trigger_context}{specific_issue}
+
+TOP SUSPECT COMMIT:
+{suspect_formatted}
+
+TOP RUNBOOK MATCH:
+{runbook_formatted}"""
+
+
+def run_communication(incident_id: str, incident: dict | None = None) -> dict:
+    """
+    Main entry point for Communication Agent.
+    incident: the record with triage, investigation and runbook results, if
+    the orchestrator already holds it; read from DynamoDB otherwise.
+    """
     logger.info(f"[communication_agent] Generating war-room brief for {incident_id}")
     append_action_log(incident_id, "communication_agent", "agent_start", {})
 
-    incident = get_incident(incident_id)
+    if incident is None:
+        incident = get_incident(incident_id)
 
     estimated_users = _resolve_user_impact(incident)
-    brief = _call_nova_communication(incident, estimated_users)
 
+    # Nova is the slow leg — resolve the webhook and persist the impact
+    # estimate while the brief is being generated
+    brief_future = _executor.submit(_call_nova_communication, incident, estimated_users)
     webhook_url = incident.get("slack_webhook_url") or _get_slack_webhook()
+    update_incident(incident_id, {"estimated_users_affected": estimated_users})
+    brief = brief_future.result()
+
     message_id = _post_to_slack(
         brief, incident_id, incident, estimated_users, webhook_url
     )
 
-    update_incident(
-        incident_id,
-        {
-            "slack_message_id": message_id or "posted",
-            "estimated_users_affected": estimated_users,
-        },
-    )
-
-    append_action_log(
+    update_and_append(
         incident_id,
-        "communication_agent",
-        "slack_brief_posted",
-        {
-            "channel": SLACK_CHANNEL,
-            "estimated_users_affected": estimated_users,
-            "message_id": message_id,
-        },
+        {"slack_message_id": message_id or "posted"},
+        action_log_entry(
+            "communication_agent",
+            "slack_brief_posted",
+            {
+                "channel": SLACK_CHANNEL,
+                "estimated_users_affected": estimated_users,
+                "message_id": message_id,
+            },
+        ),
     )
 
     logger.info(
@@ -115,12 +185,7 @@ def _severity_based_estimate(incident: dict) -> int:
     severity = incident.get("severity", "MED")
     blast_radius = incident.get("blast_radius", [])
 
-    base_by_severity = {
-        "HIGH": 8743,
-        "MED": 2156,
-        "LOW": 341,
-    }
-    base = base_by_severity.get(severity, 2156)
+    base = SEVERITY_BASE_USERS.get(severity, SEVERITY_BASE_USERS["MED"])
 
     # Scale up slightly for each additional affected service
     extra_services = max(0, len(blast_radius) - 1)
@@ -150,7 +215,7 @@ def _format_suspect_commit(suspect: dict) -> str:
 
 def _call_nova_communication(incident: dict, estimated_users: int) -> str:
     """Use Nova 2 Lite to generate a human-readable Slack war-room brief."""
-    bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+    bedrock = bedrock_runtime()
 
     severity = incident.get("severity", "MED")
     blast_radius = incident.get("blast_radius", [])
@@ -188,64 +253,41 @@ def _call_nova_communication(incident: dict, estimated_users: int) -> str:
             f"First Action Step: {top_runbook.get('first_action_step', 'See runbook')}"
         )
 
-    system_prompt = """You are an SRE bot generating a production incident war-room brief for Slack.
-Write in a clear, urgent, professional tone. Be concise — engineers are under pressure.
-
-CRITICAL SLACK FORMATTING RULES:
-- Bold text: *single asterisks* — NEVER use **double asterisks**
-- Code: `backticks`
-- NEVER use ## markdown headers — use *SECTION TITLE:* style instead
-- Bullet points: use -
-
-Respond with ONLY the Slack message text, nothing else."""
-
-    user_message = f"""Generate a Slack war-room brief for this incident:
-
-INCIDENT ID: {incident_id[:8]}
-REPO: {repo_id}
-SEVERITY: {severity}
-BLAST RADIUS: {', '.join(blast_radius)}
-ESTIMATED USERS AFFECTED: ~{estimated_users:,}
-TRIAGE SUMMARY: {triage_summary}{trigger_context}{specific_issue}
-
-TOP SUSPECT COMMIT:
-{suspect_formatted}
-
-TOP RUNBOOK MATCH:
-{runbook_formatted}
-
-The message MUST include:
-1. A severity header with emoji (🔴 HIGH / 🟡 MED / 🟢 LOW)
-2. Repo + blast radius
-3. Estimated user impact (~{estimated_users:,} users)
-4. Triggering commit hash and author
-5. Specific issue found — cite the actual lines and what they do wrong
-6. First action step from runbook (if available)
-7. 2-3 immediate action items
-8. "Reply to this thread with updates."
-
-Keep it under 300 words. Make it scannable. Do NOT output raw JSON anywhere."""
-
-    response = bedrock.invoke_model(
-        modelId=NOVA_LITE_MODEL,
-        body=json.dumps(
-            {
-                "messages": [{"role": "user", "content": [{"text": user_message}]}],
-                "system": [{"text": system_prompt}],
-                "inferenceConfig": {"maxTokens": 512, "temperature": 0.3},
-            }
-        ),
-        contentType="application/json",
-        accept="application/json",
+    user_message = INCIDENT_DETAILS_TEMPLATE.format_map(
+        {
+            "incident_id": incident_id[:8],
+            "repo_id": repo_id,
+            "severity": severity,
+            "blast_radius": ", ".join(blast_radius),
+            "estimated_users": estimated_users,
+            "triage_summary": triage_summary,
+            "trigger_context": trigger_context,
+            "specific_issue": specific_issue,
+            "suspect_formatted": suspect_formatted,
+            "runbook_formatted": runbook_formatted,
+        }
     )
 
-    response_body = json.loads(response["body"].read())
-    raw = response_body["output"]["message"]["content"][0]["text"].strip()
+    # Streamed so the read timeout applies per chunk rather than to the whole
+    # 512-token generation
+    raw = "".join(
+        stream_nova(
+            bedrock,
+            NOVA_LITE_MODEL,
+            system_prompt=SYSTEM_PROMPT,
+            user_message=user_message,
+            max_tokens=512,
+            temperature=0.3,
+            static_instructions=BRIEF_INSTRUCTIONS,
+        )
+    ).strip()
 
     # Post-process: strip any **double asterisks** that snuck through
-    raw = re.sub(r"\*\*(.+?)\*\*", r"*\1*", raw)
+    if "**" in raw:
+        raw = raw.replace("**", "*")
     # Post-process: strip any raw JSON-looking blobs that snuck through
-    raw = re.sub(r'\{["\']reason["\'].*?\}', "", raw, flags=re.DOTALL)
+    if "reason" in raw:
+        raw = _REASON_BLOB_RE.sub("", raw)
 
     return raw
 
@@ -297,15 +339,20 @@ def _post_to_slack(
     }
 
     try:
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
+        resp = HTTP.request(
+            "POST",
             webhook_url,
-            data=data,
+            body=orjson.dumps(payload),
             headers={"Content-Type": "application/json"},
-            method="POST",
+            timeout=10,
         )
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            return resp.read().decode() or "posted"
+        if resp.status >= 400:
+            logger.error(
+                f"[communication_agent] Slack post failed: HTTP {resp.status} — "
+                f"{resp.data.decode(errors='replace')}"
+            )
+            return None
+        return resp.data.decode() or "posted"
     except Exception as e:
         logger.error(f"[communication_agent] Slack post failed: {e}")
         return None
@@ -314,10 +361,8 @@ def _post_to_slack(
 def _get_slack_webhook() -> str | None:
     """Fetch global Slack webhook from Secrets Manager (fallback)."""
     try:
-        sm = boto3.client("secretsmanager", region_name=AWS_REGION)
-        response = sm.get_secret_value(SecretId="incidentiq/slack-webhook")
-        secret = json.loads(response["SecretString"])
-        return secret.get("webhook_url") or response["SecretString"]
+        secret = get_secret("incidentiq/slack-webhook")
+        return secret.get("webhook_url")
     except Exception as e:
         logger.warning(f"[communication_agent] Could not fetch Slack webhook: {e}")
         return None
@@ -10,13 +10,12 @@ Returns truncated, token-aware diffs suitable for Nova context.
 
 from __future__ import annotations
 
-import json
 import logging
-import urllib.request
-import urllib.error
 import re
 from typing import Optional
 
+from backend.integrations.http_pool import HTTP
+
 logger = logging.getLogger(__name__)
 
 # Max characters of diff to pass to Nova — keeps us under token limits
@@ -42,16 +41,9 @@ def fetch_commit_diff(
     url = f"https://api.github.com/repos/{repo_id}/commits/{commit_sha}"
 
     try:
-        req = urllib.request.Request(
-            url,
-            headers={
-                "Authorization": f"token {github_token}",
-                "Accept": "application/vnd.github.v3.diff",
-                "User-Agent": "IncidentIQ/2.0",
-            },
-        )
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            raw_diff = resp.read().decode("utf-8", errors="replace")
+        raw_diff = _get_diff(url, github_token)
+        if raw_diff is None:
+            return None
 
         logger.info(
             f"[diff_fetcher] Fetched diff for {commit_sha[:8]}: "
@@ -61,11 +53,6 @@ def fetch_commit_diff(
 
         return _truncate_diff(raw_diff)
 
-    except urllib.error.HTTPError as e:
-        logger.error(
-            f"[diff_fetcher] HTTP {e.code} fetching diff for {commit_sha}: {e.read().decode()}"
-        )
-        return None
     except Exception as e:
         logger.error(f"[diff_fetcher] Failed to fetch diff for {commit_sha}: {e}")
         return None
@@ -84,16 +71,9 @@ def fetch_compare_diff(
     url = f"https://api.github.com/repos/{repo_id}/compare/{base_sha}...{head_sha}"
 
     try:
-        req = urllib.request.Request(
-            url,
-            headers={
-                "Authorization": f"token {github_token}",
-                "Accept": "application/vnd.github.v3.diff",
-                "User-Agent": "IncidentIQ/2.0",
-            },
-        )
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            raw_diff = resp.read().decode("utf-8", errors="replace")
+        raw_diff = _get_diff(url, github_token)
+        if raw_diff is None:
+            return None
 
         logger.info(
             f"[diff_fetcher] Fetched compare diff {base_sha[:8]}...{head_sha[:8]}: "
@@ -107,6 +87,30 @@ def fetch_compare_diff(
         return None
 
 
+def _get_diff(url: str, github_token: str) -> Optional[str]:
+    """
+    GET a unified diff from the GitHub API over the shared connection pool.
+    Returns None (and logs) on an HTTP error status.
+    """
+    resp = HTTP.request(
+        "GET",
+        url,
+        headers={
+            "Authorization": f"token {github_token}",
+            "Accept": "application/vnd.github.v3.diff",
+            "User-Agent": "IncidentIQ/2.0",
+        },
+        timeout=15,
+    )
+    if resp.status >= 400:
+        logger.error(
+            f"[diff_fetcher] HTTP {resp.status} fetching {url}: "
+            f"{resp.data.decode(errors='replace')}"
+        )
+        return None
+    return resp.data.decode("utf-8", errors="replace")
+
+
 def _truncate_diff(raw_diff: str) -> str:
     """
     Intelligently truncate a diff to fit in Nova's context window.
@@ -22,9 +22,10 @@ import urllib.request
 from datetime import datetime, timezone
 from typing import Optional
 
-import boto3
+import orjson
 
 from backend.agents.diff_fetcher import fetch_commit_diff
+from backend.integrations.aws import bedrock_runtime, get_secret
 
 logger = logging.getLogger(__name__)
 
@@ -143,7 +144,7 @@ def _ask_nova_if_fix(
     Returns dict with is_fix, confidence, fix_description.
     """
     try:
-        bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+        bedrock = bedrock_runtime()
 
         system_prompt = """You are a senior engineer verifying whether a git commit fixes a known production bug.
 
@@ -189,7 +190,7 @@ Does this commit fix the original bug? Be strict — only say yes if the diff cl
             accept="application/json",
         )
 
-        response_body = json.loads(response["body"].read())
+        response_body = orjson.loads(response["body"].read())
         raw = response_body["output"]["message"]["content"][0]["text"].strip()
 
         if raw.startswith("```"):
@@ -258,9 +259,7 @@ def _get_github_token(repo_id: str) -> Optional[str]:
         pass
 
     try:
-        sm = boto3.client("secretsmanager", region_name=AWS_REGION)
-        response = sm.get_secret_value(SecretId="incidentiq/github-token")
-        secret = json.loads(response["SecretString"])
+        secret = get_secret("incidentiq/github-token")
         return secret.get("token")
     except Exception as e:
         logger.warning(f"[fix_detector] Could not fetch token: {e}")
@@ -13,37 +13,138 @@ Output: suspect_commits [{commit_hash, author, confidence, reason, diff_analysis
 
 from __future__ import annotations
 
-import json
 import logging
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
-import boto3
-import urllib.request
-
-from backend.models.incident import append_action_log, get_incident, update_incident
+import orjson
+
+from backend.integrations.aws import bedrock_runtime, get_secret
+from backend.integrations.bedrock import invoke_nova, parse_json_text
+from backend.integrations.http_pool import HTTP
+from backend.models.incident import (
+    action_log_entry,
+    append_action_log,
+    get_incident,
+    update_and_append,
+)
 from backend.agents.diff_fetcher import fetch_commit_diff, fetch_compare_diff
 
 logger = logging.getLogger(__name__)
 
 NOVA_LITE_MODEL = "us.amazon.nova-lite-v1:0"
+# Point at a latency-optimized model (e.g. us.amazon.nova-pro-v1:0) to get
+# optimized inference — Nova Lite isn't offered in that mode
+INVESTIGATION_MODEL = os.environ.get("INVESTIGATION_MODEL_ID", NOVA_LITE_MODEL)
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 
 GITHUB_ORG = os.environ.get("GITHUB_ORG", "HimJar911")
 GITHUB_REPO = os.environ.get("GITHUB_REPO", "payments-service")
 LOOKBACK_HOURS = int(os.environ.get("COMMIT_LOOKBACK_HOURS", "168"))
 
-
-def run_investigation(incident_id: str) -> dict:
-    """Main entry point. Returns suspect_commits list."""
+# Prompt size caps. Commit messages past the subject line rarely help ranking;
+# the triage caps only bite on pathological input.
+PROMPT_MESSAGE_CHARS = 120
+MAX_PROMPT_SUMMARY_CHARS = 800
+MAX_PROMPT_SERVICES = 32
+# Bulk commits (vendoring, codegen, renames) can list hundreds of paths — the
+# diff section already carries the risk-ranked files
+MAX_PROMPT_FILES_PER_COMMIT = 20
+_FILE_STATUS_KEYS = (
+    ("M", "files_modified"),
+    ("A", "files_added"),
+    ("D", "files_removed"),
+)
+
+# Incidents seconds apart ask GitHub for the same commit window — reuse the
+# last listing per repo for this long (negligible next to LOOKBACK_HOURS).
+# Past the TTL the listing's ETag is sent back so an unchanged history costs a
+# 304 with no body instead of a full listing.
+COMMIT_CACHE_TTL_SECONDS = 120
+# (org, repo) → (fetched_at, etag, commits)
+_commit_cache: dict[tuple[str, str], tuple[float, Optional[str], list[dict]]] = {}
+
+# Shared across incidents — fans out the per-commit GitHub diff fetches
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="investigation")
+
+
+def run_investigation(
+    incident_id: str,
+    commits: Optional[list[dict]] = None,
+    incident: Optional[dict] = None,
+) -> dict:
+    """
+    Main entry point. Returns suspect_commits list.
+    commits: output of prefetch_commits() if the orchestrator already ran it;
+    collected here otherwise.
+    incident: the post-triage record if the orchestrator already holds it.
+    """
     logger.info(f"[investigation_agent] Starting investigation for {incident_id}")
     append_action_log(incident_id, "investigation_agent", "agent_start", {})
 
-    incident = get_incident(incident_id)
-    alert_payload = incident.get("alert_payload", {})
+    if incident is None:
+        incident = get_incident(incident_id)
     alert_source = incident.get("alert_source", "CloudWatch")
     blast_radius = incident.get("blast_radius", [])
     triage_summary = incident.get("triage_summary_snippet", "")
+
+    if commits is None:
+        commits = _collect_commits(incident)
+
+    # Ask Nova to analyze
+    suspect_commits = _call_nova_investigate(
+        blast_radius=blast_radius,
+        triage_summary=triage_summary,
+        commits=commits,
+        alert_source=alert_source,
+    )
+
+    update_and_append(
+        incident_id,
+        {"suspect_commits": suspect_commits},
+        action_log_entry(
+            "investigation_agent",
+            "investigation_complete",
+            {
+                "suspect_count": len(suspect_commits),
+                "top_suspect": suspect_commits[0] if suspect_commits else None,
+                "source": (
+                    "webhook_payload" if alert_source == "GitHub" else "github_api"
+                ),
+                "diff_enriched": any(c.get("diff") for c in commits),
+            },
+        ),
+    )
+
+    logger.info(f"[investigation_agent] Complete — {len(suspect_commits)} suspects")
+    return {"suspect_commits": suspect_commits}
+
+
+def prefetch_commits(
+    alert_payload: dict, alert_source: str, repo_id: Optional[str] = None
+) -> list[dict]:
+    """
+    Collect and diff-enrich the commits for a just-ingested alert.
+    Needs only what ingest wrote (alert payload, source, repo_id) — nothing
+    from triage — so the orchestrator runs it alongside the Triage Agent on
+    the values it already holds, without reading the incident back.
+    """
+    return _collect_commits(
+        {
+            "alert_payload": alert_payload,
+            "alert_source": alert_source,
+            "repo_id": repo_id or "",
+        }
+    )
+
+
+def _collect_commits(incident: dict) -> list[dict]:
+    """Commits from the webhook payload or GitHub API, with diffs attached."""
+    alert_payload = incident.get("alert_payload", {})
+    alert_source = incident.get("alert_source", "CloudWatch")
     repo_id = incident.get("repo_id", "")
 
     # Get GitHub token for diff fetching
@@ -73,30 +174,7 @@ def run_investigation(incident_id: str) -> dict:
             "[investigation_agent] No GitHub token — skipping diff enrichment"
         )
 
-    # Ask Nova to analyze
-    suspect_commits = _call_nova_investigate(
-        blast_radius=blast_radius,
-        triage_summary=triage_summary,
-        commits=commits,
-        alert_source=alert_source,
-    )
-
-    update_incident(incident_id, {"suspect_commits": suspect_commits})
-
-    append_action_log(
-        incident_id,
-        "investigation_agent",
-        "investigation_complete",
-        {
-            "suspect_count": len(suspect_commits),
-            "top_suspect": suspect_commits[0] if suspect_commits else None,
-            "source": "webhook_payload" if alert_source == "GitHub" else "github_api",
-            "diff_enriched": any(c.get("diff") for c in commits),
-        },
-    )
-
-    logger.info(f"[investigation_agent] Complete — {len(suspect_commits)} suspects")
-    return {"suspect_commits": suspect_commits}
+    return commits
 
 
 def _enrich_commits_with_diffs(
@@ -135,26 +213,34 @@ def _enrich_commits_with_diffs(
                 enriched.append(c)
             return enriched
 
-    # Single commit or compare failed: fetch individual diffs
-    for commit in commits:
-        c = dict(commit)
-        sha = commit.get("full_sha") or commit.get("commit_hash", "")
-
-        if sha and len(sha) >= 7:
-            diff = fetch_commit_diff(repo_id, sha, github_token)
-            c["diff"] = diff
-            c["diff_type"] = "single_commit" if diff else "fetch_failed"
-            if diff:
-                logger.info(
-                    f"[investigation_agent] Got diff for {sha[:8]}: {len(diff)} chars"
-                )
-        else:
-            c["diff"] = None
-            c["diff_type"] = "no_sha"
+    # Single commit or compare failed: fetch individual diffs, in parallel —
+    # each is an independent GitHub round-trip
+    return list(
+        _executor.map(
+            lambda commit: _attach_commit_diff(commit, repo_id, github_token),
+            commits,
+        )
+    )
 
-        enriched.append(c)
 
-    return enriched
+def _attach_commit_diff(commit: dict, repo_id: str, github_token: str) -> dict:
+    """Return a copy of commit with its single-commit diff attached."""
+    c = dict(commit)
+    sha = commit.get("full_sha") or commit.get("commit_hash", "")
+
+    if sha and len(sha) >= 7:
+        diff = fetch_commit_diff(repo_id, sha, github_token)
+        c["diff"] = diff
+        c["diff_type"] = "single_commit" if diff else "fetch_failed"
+        if diff:
+            logger.info(
+                f"[investigation_agent] Got diff for {sha[:8]}: {len(diff)} chars"
+            )
+    else:
+        c["diff"] = None
+        c["diff_type"] = "no_sha"
+
+    return c
 
 
 def _extract_commits_from_payload(alert_payload: dict) -> list[dict]:
@@ -162,24 +248,55 @@ def _extract_commits_from_payload(alert_payload: dict) -> list[dict]:
     raw_commits = alert_payload.get("all_commits", [])
     head_commit = alert_payload.get("head_commit", {})
 
-    commits = []
-    for c in raw_commits:
-        commits.append(
-            {
-                "commit_hash": c.get("id", "")[:8],
-                "full_sha": c.get("full_sha", c.get("id", "")),
-                "author": c.get("author", "unknown"),
-                "message": c.get("message", "")[:200],
-                "timestamp": c.get("timestamp", ""),
-                "files_modified": c.get("modified", []),
-                "files_added": c.get("added", []),
-                "files_removed": c.get("removed", []),
-                "html_url": c.get("url", ""),
-                "is_head": c.get("id", "")[:8] == head_commit.get("id", "")[:8],
-            }
-        )
+    head_id = head_commit.get("id", "")[:8]
 
-    return commits
+    return [
+        {
+            "commit_hash": (commit_id := c.get("id", "")[:8]),
+            "full_sha": c.get("full_sha", c.get("id", "")),
+            "author": c.get("author", "unknown"),
+            "message": c.get("message", "")[:200],
+            "timestamp": c.get("timestamp", ""),
+            "files_modified": c.get("modified", []),
+            "files_added": c.get("added", []),
+            "files_removed": c.get("removed", []),
+            "html_url": c.get("url", ""),
+            "is_head": commit_id == head_id,
+        }
+        for c in raw_commits
+    ]
+
+
+def _summarize_commit(commit: dict) -> dict:
+    """
+    Compact commit metadata for the Nova prompt.
+    Only fields Nova ranks on; empty lists and false flags are left out.
+    The full commit records are untouched (they still carry diffs, URLs, SHAs).
+    """
+    summary = {
+        "commit_hash": commit.get("commit_hash", ""),
+        "author": commit.get("author", "unknown"),
+        "message": commit.get("message", "")[:PROMPT_MESSAGE_CHARS],
+        "timestamp": commit.get("timestamp", ""),
+    }
+    # One git-status style list ("M path", "A path", "D path") instead of
+    # three mostly-empty ones. A path listed twice keeps its first status.
+    files = {}
+    for status, key in _FILE_STATUS_KEYS:
+        for path in commit.get(key) or ():
+            files.setdefault(path, status)
+    if files:
+        listed = [f"{status} {path}" for path, status in files.items()]
+        if len(listed) > MAX_PROMPT_FILES_PER_COMMIT:
+            extra = len(listed) - MAX_PROMPT_FILES_PER_COMMIT
+            listed = listed[:MAX_PROMPT_FILES_PER_COMMIT]
+            listed.append(f"... {extra} more files")
+        summary["files"] = listed
+    if commit.get("is_head"):
+        summary["is_head"] = True
+    if commit.get("diff"):
+        summary["has_diff"] = True
+    return summary
 
 
 def _call_nova_investigate(
@@ -192,7 +309,13 @@ def _call_nova_investigate(
     Use Nova 2 Lite to analyze commits — now with real diffs.
     Returns ranked list of suspect commits with specific reasoning.
     """
-    bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+    bedrock = bedrock_runtime()
+
+    too_long = len(triage_summary) > MAX_PROMPT_SUMMARY_CHARS
+    if too_long or len(blast_radius) > MAX_PROMPT_SERVICES:
+        logger.info("[investigation_agent] Truncating triage context for prompt")
+        triage_summary = triage_summary[:MAX_PROMPT_SUMMARY_CHARS]
+        blast_radius = blast_radius[:MAX_PROMPT_SERVICES]
 
     # Build commit analysis section
     # Separate diff content from commit metadata to keep prompt readable
@@ -200,18 +323,7 @@ def _call_nova_investigate(
     diff_sections = []
 
     for i, commit in enumerate(commits):
-        summary = {
-            "commit_hash": commit.get("commit_hash", ""),
-            "author": commit.get("author", "unknown"),
-            "message": commit.get("message", ""),
-            "timestamp": commit.get("timestamp", ""),
-            "files_modified": commit.get("files_modified", []),
-            "files_added": commit.get("files_added", []),
-            "files_removed": commit.get("files_removed", []),
-            "is_head": commit.get("is_head", False),
-            "has_diff": bool(commit.get("diff")),
-        }
-        commit_summaries.append(summary)
+        commit_summaries.append(_summarize_commit(commit))
 
         if commit.get("diff"):
             diff_sections.append(
@@ -253,7 +365,7 @@ Affected services: {', '.join(blast_radius)}
 Triage summary: {triage_summary}
 
 COMMIT METADATA:
-{json.dumps(commit_summaries, indent=2, default=str)}
+{orjson.dumps(commit_summaries, default=str).decode()}
 
 CODE DIFFS (actual changed lines):
 {chr(10).join(diff_sections) if diff_sections else "No diffs available — analyze from commit metadata only."}
@@ -263,29 +375,22 @@ If diffs are available, cite specific lines or variables.
 Confidence 0.0-1.0. Only include commits with confidence > 0.3.
 Respond with ONLY the JSON object."""
 
-    response = bedrock.invoke_model(
-        modelId=NOVA_LITE_MODEL,
-        body=json.dumps(
-            {
-                "messages": [{"role": "user", "content": [{"text": user_message}]}],
-                "system": [{"text": system_prompt}],
-                "inferenceConfig": {"maxTokens": 1024, "temperature": 0.2},
-            }
-        ),
-        contentType="application/json",
-        accept="application/json",
+    raw_text = invoke_nova(
+        bedrock,
+        INVESTIGATION_MODEL,
+        system_prompt=system_prompt,
+        user_message=user_message,
+        max_tokens=768,
+        temperature=0.2,
     )
 
-    response_body = json.loads(response["body"].read())
-    raw_text = response_body["output"]["message"]["content"][0]["text"].strip()
-
-    if raw_text.startswith("```"):
-        raw_text = raw_text.split("```")[1]
-        if raw_text.startswith("json"):
-            raw_text = raw_text[4:]
-        raw_text = raw_text.strip()
-
-    result = json.loads(raw_text)
+    try:
+        result = parse_json_text(raw_text)
+    except ValueError as e:
+        logger.warning(
+            f"[investigation_agent] Unparseable Nova output — no suspects recorded: {e}"
+        )
+        return []
     return result.get("suspect_commits", [])
 
 
@@ -323,48 +428,68 @@ def _fetch_github_commits_for_repo(incident: dict, alert_payload: dict) -> list[
         logger.warning("[investigation_agent] No GitHub token available")
         return []
 
+    cached = _commit_cache.get((org, repo))
+    if cached and time.monotonic() - cached[0] < COMMIT_CACHE_TTL_SECONDS:
+        logger.info(
+            f"[investigation_agent] Reusing cached commit list for {org}/{repo}"
+        )
+        return list(cached[2])
+
     since = (datetime.now(timezone.utc) - timedelta(hours=LOOKBACK_HOURS)).isoformat()
     commits = []
 
+    headers = {
+        "Authorization": f"token {github_token}",
+        "Accept": "application/vnd.github.v3+json",
+        "User-Agent": "IncidentIQ/2.0",
+    }
+    if cached and cached[1]:
+        headers["If-None-Match"] = cached[1]
+
     try:
         url = f"https://api.github.com/repos/{org}/{repo}/commits?since={since}&per_page=20"
-        req = urllib.request.Request(
-            url,
-            headers={
-                "Authorization": f"token {github_token}",
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "IncidentIQ/2.0",
-            },
+        resp = HTTP.request("GET", url, headers=headers, timeout=10)
+        if resp.status == 304:
+            logger.info(f"[investigation_agent] Commit list unchanged for {org}/{repo}")
+            _commit_cache[(org, repo)] = (time.monotonic(), cached[1], cached[2])
+            return list(cached[2])
+        if resp.status >= 400:
+            raise RuntimeError(f"HTTP {resp.status} listing commits for {org}/{repo}")
+        commits = [_commit_from_api(commit) for commit in orjson.loads(resp.data)]
+
+        _commit_cache[(org, repo)] = (
+            time.monotonic(),
+            resp.headers.get("ETag"),
+            commits,
         )
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
-
-        for commit in data:
-            commits.append(
-                {
-                    "commit_hash": commit["sha"][:8],
-                    "full_sha": commit["sha"],
-                    "author": commit["commit"]["author"]["name"],
-                    "message": commit["commit"]["message"][:200],
-                    "timestamp": commit["commit"]["author"]["date"],
-                    "files_modified": [],
-                    "html_url": commit["html_url"],
-                    "is_head": False,
-                }
-            )
 
     except Exception as e:
         logger.error(f"[investigation_agent] GitHub API error: {e}")
 
-    return commits
+    return list(commits)
+
+
+def _commit_from_api(commit: dict) -> dict:
+    """Project one GitHub /commits list item onto the investigation commit shape."""
+    sha = commit["sha"]
+    details = commit["commit"]
+    author = details["author"]
+    return {
+        "commit_hash": sha[:8],
+        "full_sha": sha,
+        "author": author["name"],
+        "message": details["message"][:200],
+        "timestamp": author["date"],
+        "files_modified": [],
+        "html_url": commit["html_url"],
+        "is_head": False,
+    }
 
 
 def _get_github_token_from_secrets() -> Optional[str]:
     """Fetch GitHub token from Secrets Manager."""
     try:
-        sm = boto3.client("secretsmanager", region_name=AWS_REGION)
-        response = sm.get_secret_value(SecretId="incidentiq/github-token")
-        secret = json.loads(response["SecretString"])
+        secret = get_secret("incidentiq/github-token")
         return secret.get("token")
     except Exception as e:
         logger.warning(f"[investigation_agent] Could not fetch GitHub token: {e}")
@@ -372,19 +497,19 @@ def _get_github_token_from_secrets() -> Optional[str]:
 
 
 def _get_demo_commits() -> list[dict]:
-    return [
-        {
-            "commit_hash": "492110ac",
-            "full_sha": "492110ac0000000000000000000000000000000000",
-            "author": "him.jar",
-            "message": "fix: adjust fee calculation divisor for new pricing model",
-            "timestamp": "2026-02-14T01:45:00Z",
-            "files_modified": ["main.py"],
-            "html_url": "https://github.com/HimJar911/payments-service/commit/492110ac",
-            "is_head": True,
-        },
-    ]
+    return list(_DEMO_COMMITS)
 
 
-# Fix missing Optional import
-from typing import Optional
+# Fallback when no commits can be found. Shared, so treat as read-only.
+_DEMO_COMMITS = (
+    {
+        "commit_hash": "492110ac",
+        "full_sha": "492110ac0000000000000000000000000000000000",
+        "author": "him.jar",
+        "message": "fix: adjust fee calculation divisor for new pricing model",
+        "timestamp": "2026-02-14T01:45:00Z",
+        "files_modified": ["main.py"],
+        "html_url": "https://github.com/HimJar911/payments-service/commit/492110ac",
+        "is_head": True,
+    },
+)
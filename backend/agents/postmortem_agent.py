@@ -13,15 +13,23 @@ Output: markdown postmortem → S3 + postmortem_s3_path → DynamoDB
 
 from __future__ import annotations
 
-import json
+import gzip
 import logging
 import os
 from datetime import datetime, timezone
 from decimal import Decimal
+from operator import itemgetter
 
-import boto3
+import orjson
 
-from backend.models.incident import append_action_log, get_incident, update_incident
+from backend.integrations.aws import bedrock_runtime, s3
+from backend.integrations.bedrock import stream_nova
+from backend.models.incident import (
+    action_log_entry,
+    append_action_log,
+    get_incident,
+    update_and_append,
+)
 
 
 def _decimal_serializer(obj):
@@ -30,11 +38,23 @@ def _decimal_serializer(obj):
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
+def _to_prompt_json(obj) -> str:
+    """Compact JSON for the postmortem prompt — indentation is billed as input tokens."""
+    return orjson.dumps(obj, default=_decimal_serializer).decode()
+
+
 logger = logging.getLogger(__name__)
 
 NOVA_LITE_MODEL = "us.amazon.nova-lite-v1:0"
+# Overridable so postmortems can run on a model Bedrock serves latency-optimized
+# (see LATENCY_OPTIMIZED_MODELS in backend.integrations.bedrock)
+POSTMORTEM_MODEL = os.environ.get("POSTMORTEM_MODEL_ID", NOVA_LITE_MODEL)
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 
+# Bounds on free-form incident fields embedded in the prompt
+MAX_PROMPT_SUMMARY_CHARS = 800
+MAX_PROMPT_SERVICES = 32
+
 
 def run_postmortem(incident_id: str) -> dict:
     """
@@ -49,16 +69,22 @@ def run_postmortem(incident_id: str) -> dict:
     postmortem_md = _call_nova_postmortem(incident)
     s3_path = _upload_to_s3(incident_id, postmortem_md)
 
-    update_incident(incident_id, {"postmortem_s3_path": s3_path})
-
-    append_action_log(
+    update_and_append(
         incident_id,
-        "postmortem_agent",
-        "postmortem_complete",
         {
-            "s3_path": s3_path,
-            "char_count": len(postmortem_md),
+            "postmortem_s3_path": s3_path,
+            # Postmortems are rewritten to the same key on re-runs; readers
+            # use this to tell versions apart (see the API's postmortem cache)
+            "postmortem_generated_at": datetime.now(timezone.utc).isoformat(),
         },
+        action_log_entry(
+            "postmortem_agent",
+            "postmortem_complete",
+            {
+                "s3_path": s3_path,
+                "char_count": len(postmortem_md),
+            },
+        ),
     )
 
     logger.info(f"[postmortem_agent] Postmortem complete — uploaded to {s3_path}")
@@ -70,12 +96,14 @@ def _call_nova_postmortem(incident: dict) -> str:
     Use Nova 2 Lite for structured long-form reasoning over the full audit trail.
     Now includes resolution notes and verified fix commit.
     """
-    bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+    bedrock = bedrock_runtime()
 
     incident_id = incident.get("incident_id", "unknown")
     severity = incident.get("severity", "MED")
-    blast_radius = incident.get("blast_radius", [])
-    triage_summary = incident.get("triage_summary_snippet", "")
+    blast_radius = incident.get("blast_radius", [])[:MAX_PROMPT_SERVICES]
+    triage_summary = incident.get("triage_summary_snippet", "")[
+        :MAX_PROMPT_SUMMARY_CHARS
+    ]
     suspect_commits = incident.get("suspect_commits", [])
     runbook_hits = incident.get("runbook_hits", [])
     actions_log = incident.get("actions_log", [])
@@ -138,13 +166,13 @@ INCIDENT DETAILS:
 - Triage Summary: {triage_summary}
 
 SUSPECT COMMITS (automated investigation):
-{json.dumps(suspect_commits, indent=2, default=_decimal_serializer)}
+{_to_prompt_json(suspect_commits)}
 
 RUNBOOK SECTIONS REFERENCED:
-{json.dumps([{'id': r.get('runbook_id'), 'section': r.get('section'), 'relevance': r.get('relevance')} for r in runbook_hits], indent=2, default=_decimal_serializer)}
+{_to_prompt_json([{'id': r.get('runbook_id'), 'section': r.get('section'), 'relevance': r.get('relevance')} for r in runbook_hits])}
 
 FULL AUDIT TRAIL:
-{json.dumps(timeline_entries, indent=2, default=_decimal_serializer)}
+{_to_prompt_json(timeline_entries)}
 {resolution_context}
 
 Write the complete postmortem.
@@ -153,24 +181,18 @@ Write the complete postmortem.
 - Action Items: 3-5 concrete follow-up tasks with owners (use TBD)
 - Root Cause: cite the specific code change from suspect commits"""
 
-    response = bedrock.invoke_model(
-        modelId=NOVA_LITE_MODEL,
-        body=json.dumps(
-            {
-                "messages": [{"role": "user", "content": [{"text": user_message}]}],
-                "system": [{"text": system_prompt}],
-                "inferenceConfig": {
-                    "maxTokens": 2048,
-                    "temperature": 0.4,
-                },
-            }
-        ),
-        contentType="application/json",
-        accept="application/json",
-    )
-
-    response_body = json.loads(response["body"].read())
-    postmortem_text = response_body["output"]["message"]["content"][0]["text"].strip()
+    # Long-form output (up to 1536 tokens) — streamed so the read timeout
+    # applies per chunk rather than to the whole generation
+    postmortem_text = "".join(
+        stream_nova(
+            bedrock,
+            POSTMORTEM_MODEL,
+            system_prompt=system_prompt,
+            user_message=user_message,
+            max_tokens=1536,
+            temperature=0.4,
+        )
+    ).strip()
 
     header = f"""# Incident Postmortem — {incident_id[:8].upper()}
 
@@ -188,14 +210,16 @@ def _upload_to_s3(incident_id: str, content: str) -> str:
     if not S3_BUCKET:
         return f"local://{incident_id}_postmortem.md"
 
-    s3 = boto3.client("s3", region_name=AWS_REGION)
     key = f"postmortem-docs/{incident_id}/postmortem.md"
 
-    s3.put_object(
+    # Markdown compresses several-fold; readers check ContentEncoding
+    # (browsers/CloudFront decode it transparently)
+    s3().put_object(
         Bucket=S3_BUCKET,
         Key=key,
-        Body=content.encode("utf-8"),
+        Body=gzip.compress(content.encode("utf-8"), compresslevel=6),
         ContentType="text/markdown",
+        ContentEncoding="gzip",
         Metadata={"incident_id": incident_id},
     )
     return f"s3://{S3_BUCKET}/{key}"
@@ -224,41 +248,47 @@ def _build_timeline(
     timeline = [{"ts": created_at, "event": "Incident detected — push event received"}]
 
     for entry in actions_log:
-        agent = entry.get("agent", "")
-        action_type = entry.get("action_type", "")
         ts = entry.get("ts", "")
-        details = entry.get("details", {})
-
-        event_map = {
-            ("triage_agent", "triage_complete"): (
-                f"Triage complete — {details.get('severity', '')} severity, "
-                f"blast radius: {details.get('blast_radius', [])}"
-            ),
-            ("investigation_agent", "investigation_complete"): (
-                f"Investigation complete — {details.get('suspect_count', 0)} suspects identified"
-            ),
-            ("runbook_agent", "runbook_search_complete"): (
-                f"Runbook search complete — {details.get('hits_count', 0)} relevant runbooks found"
-            ),
-            ("communication_agent", "slack_brief_posted"): (
-                f"War-room brief posted to Slack — "
-                f"~{details.get('estimated_users_affected', 0):,} users affected"
-            ),
-            ("api", "incident_resolved"): "Incident marked resolved by engineer",
-            ("api", "resolution_notes_added"): (
-                f"Resolution notes recorded: {details.get('notes_preview', '')}"
-            ),
-            ("fix_detector", "fix_commit_identified"): (
-                f"Fix commit verified: {details.get('commit_hash', '')} — "
-                f"{details.get('fix_description', '')}"
-            ),
-        }
-
-        event_text = event_map.get((agent, action_type))
-        if event_text and ts:
-            timeline.append({"ts": ts, "event": event_text})
+        if not ts:
+            continue
+        describe = _TIMELINE_EVENTS.get(
+            (entry.get("agent", ""), entry.get("action_type", ""))
+        )
+        if describe:
+            timeline.append({"ts": ts, "event": describe(entry.get("details", {}))})
 
     if resolved_at:
         timeline.append({"ts": resolved_at, "event": "Incident fully resolved"})
 
-    return sorted(timeline, key=lambda x: x.get("ts", ""))
+    # actions_log is append-ordered, which is nearly ts-ordered (parallel
+    # agents can interleave) — Timsort handles the presorted runs in ~O(n)
+    timeline.sort(key=itemgetter("ts"))
+    return timeline
+
+
+# (agent, action_type) → timeline text for that audit-log entry.
+# Only the matching entry's text is formatted.
+_TIMELINE_EVENTS = {
+    ("triage_agent", "triage_complete"): lambda d: (
+        f"Triage complete — {d.get('severity', '')} severity, "
+        f"blast radius: {d.get('blast_radius', [])}"
+    ),
+    ("investigation_agent", "investigation_complete"): lambda d: (
+        f"Investigation complete — {d.get('suspect_count', 0)} suspects identified"
+    ),
+    ("runbook_agent", "runbook_search_complete"): lambda d: (
+        f"Runbook search complete — {d.get('hits_count', 0)} relevant runbooks found"
+    ),
+    ("communication_agent", "slack_brief_posted"): lambda d: (
+        f"War-room brief posted to Slack — "
+        f"~{d.get('estimated_users_affected', 0):,} users affected"
+    ),
+    ("api", "incident_resolved"): lambda d: "Incident marked resolved by engineer",
+    ("api", "resolution_notes_added"): lambda d: (
+        f"Resolution notes recorded: {d.get('notes_preview', '')}"
+    ),
+    ("fix_detector", "fix_commit_identified"): lambda d: (
+        f"Fix commit verified: {d.get('commit_hash', '')} — "
+        f"{d.get('fix_description', '')}"
+    ),
+}
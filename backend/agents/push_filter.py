@@ -21,7 +21,9 @@ import logging
 import os
 import re
 
-import boto3
+import orjson
+
+from backend.integrations.aws import bedrock_runtime
 
 logger = logging.getLogger(__name__)
 
@@ -306,7 +308,7 @@ def _nova_risk_check(
     Cost: ~$0.001 per call.
     """
     try:
-        bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+        bedrock = bedrock_runtime()
 
         system_prompt = """You are a senior SRE deciding whether a git push warrants waking up an on-call engineer.
 
@@ -340,7 +342,7 @@ Should this push trigger an incident investigation?"""
             accept="application/json",
         )
 
-        response_body = json.loads(response["body"].read())
+        response_body = orjson.loads(response["body"].read())
         raw = response_body["output"]["message"]["content"][0]["text"].strip()
 
         # Strip markdown fences if present
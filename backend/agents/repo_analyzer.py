@@ -22,7 +22,9 @@ import urllib.request
 import urllib.error
 from typing import Optional
 
-import boto3
+import orjson
+
+from backend.integrations.aws import bedrock_agent, bedrock_runtime, s3
 
 logger = logging.getLogger(__name__)
 
@@ -281,9 +283,7 @@ def _sync_bedrock_kb(repo_id: str, runbook_count: int) -> None:
         return
 
     try:
-        bedrock_agent = boto3.client("bedrock-agent", region_name=AWS_REGION)
-
-        response = bedrock_agent.start_ingestion_job(
+        response = bedrock_agent().start_ingestion_job(
             knowledgeBaseId=BEDROCK_KB_ID,
             dataSourceId=BEDROCK_DATA_SOURCE_ID,
             description=f"IncidentIQ onboard sync — {repo_id} ({runbook_count} runbooks)",
@@ -361,13 +361,12 @@ def _upload_runbook_to_s3(
         return None
 
     try:
-        s3 = boto3.client("s3", region_name=AWS_REGION)
         # Safe key: replace slashes in repo_id with dashes
         safe_repo = repo_id.replace("/", "_")
         filename = original_path.replace("/", "_")
         key = f"runbooks/{safe_repo}/{filename}"
 
-        s3.put_object(
+        s3().put_object(
             Bucket=S3_BUCKET,
             Key=key,
             Body=content.encode("utf-8"),
@@ -675,7 +674,7 @@ def _estimate_dau_with_nova(
     Falls back to heuristic estimate on Nova failure.
     """
     try:
-        bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+        bedrock = bedrock_runtime()
 
         system_prompt = """You are a systems analyst estimating the scale of a software service
 based on its infrastructure configuration signals and documentation.
@@ -730,7 +729,7 @@ Estimate the realistic daily active users. If README mentions explicit numbers,
             accept="application/json",
         )
 
-        response_body = json.loads(response["body"].read())
+        response_body = orjson.loads(response["body"].read())
         raw = response_body["output"]["message"]["content"][0]["text"].strip()
 
         if raw.startswith("```"):
@@ -12,13 +12,18 @@ Output: runbook_hits [{runbook_id, section, snippet, relevance}] → DynamoDB
 
 from __future__ import annotations
 
-import json
 import logging
 import os
+import re
+import time
 
-import boto3
-
-from backend.models.incident import append_action_log, get_incident, update_incident
+from backend.integrations.aws import bedrock_agent_runtime
+from backend.models.incident import (
+    action_log_entry,
+    append_action_log,
+    get_incident,
+    update_and_append,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +31,31 @@ AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 KNOWLEDGE_BASE_ID = os.environ.get("BEDROCK_KNOWLEDGE_BASE_ID", "")
 MAX_RUNBOOK_RESULTS = 3
 
+# Replays and re-runs send the exact same query — serve those from memory.
+# Runbooks are re-ingested rarely, so ten minutes of staleness is fine.
+KB_CACHE_TTL_SECONDS = 600
+KB_CACHE_MAX_ENTRIES = 512
+_kb_cache: dict[str, tuple[float, list[dict]]] = {}
+
+# Runbook metadata, in lookup order (see _parse_runbook_metadata)
+_METADATA_COMMENT_RE = re.compile(
+    r"<!--\s*iq:runbook_id=([^\s|]+)\s*\|\s*title=([^|]+?)\s*\|\s*first_action_step=(.+?)\s*-->",
+    re.DOTALL,
+)
+_RUNBOOK_ID_RE = re.compile(r"(RB-\d+)")
+_H1_RE = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+
 
-def run_runbook(incident_id: str) -> dict:
-    """Main entry point. Returns runbook_hits list (also written to DynamoDB)."""
+def run_runbook(incident_id: str, incident: dict | None = None) -> dict:
+    """
+    Main entry point. Returns runbook_hits list (also written to DynamoDB).
+    incident: the post-triage record if the orchestrator already holds it.
+    """
     logger.info(f"[runbook_agent] Starting runbook search for {incident_id}")
     append_action_log(incident_id, "runbook_agent", "agent_start", {})
 
-    incident = get_incident(incident_id)
+    if incident is None:
+        incident = get_incident(incident_id)
     blast_radius = incident.get("blast_radius", [])
     triage_summary = incident.get("triage_summary_snippet", "")
     severity = incident.get("severity", "MED")
@@ -43,29 +66,32 @@ def run_runbook(incident_id: str) -> dict:
     runbook_hits = _search_knowledge_base(query)
 
     # ── Deduplicate by runbook_id — keep highest relevance hit per ID ─────────
+    # Hits arrive sorted by relevance, so the first hit per ID is the best one
+    # and dict insertion order keeps the ranking
     seen = {}
     for hit in runbook_hits:
-        rid = hit["runbook_id"]
-        if rid not in seen or hit["relevance"] > seen[rid]["relevance"]:
-            seen[rid] = hit
-    runbook_hits = sorted(seen.values(), key=lambda x: x["relevance"], reverse=True)
+        seen.setdefault(hit["runbook_id"], hit)
+    runbook_hits = list(seen.values())
     # ─────────────────────────────────────────────────────────────────────────
 
     if not runbook_hits:
         logger.warning("[runbook_agent] No runbook hits — using demo fallback")
         runbook_hits = _get_demo_runbook_hits(blast_radius)
 
-    update_incident(incident_id, {"runbook_hits": runbook_hits})
-
-    append_action_log(
+    update_and_append(
         incident_id,
-        "runbook_agent",
-        "runbook_search_complete",
-        {
-            "query": query,
-            "hits_count": len(runbook_hits),
-            "top_runbook": runbook_hits[0].get("runbook_id") if runbook_hits else None,
-        },
+        {"runbook_hits": runbook_hits},
+        action_log_entry(
+            "runbook_agent",
+            "runbook_search_complete",
+            {
+                "query": query,
+                "hits_count": len(runbook_hits),
+                "top_runbook": (
+                    runbook_hits[0].get("runbook_id") if runbook_hits else None
+                ),
+            },
+        ),
     )
 
     logger.info(
@@ -83,6 +109,23 @@ def _build_search_query(
 
 
 def _search_knowledge_base(query: str) -> list[dict]:
+    """KB hits for the query, sorted by relevance (highest first)."""
+    cached = _kb_cache.get(query)
+    now = time.monotonic()
+    if cached and now - cached[0] < KB_CACHE_TTL_SECONDS:
+        logger.info("[runbook_agent] Reusing cached KB hits for identical query")
+        return list(cached[1])
+
+    hits = _retrieve_from_knowledge_base(query)
+    if hits:
+        if len(_kb_cache) >= KB_CACHE_MAX_ENTRIES:
+            # Oldest insert first — good enough for a TTL cache this size
+            _kb_cache.pop(next(iter(_kb_cache)), None)
+        _kb_cache[query] = (now, hits)
+    return list(hits)
+
+
+def _retrieve_from_knowledge_base(query: str) -> list[dict]:
     if not KNOWLEDGE_BASE_ID:
         logger.warning(
             "[runbook_agent] BEDROCK_KNOWLEDGE_BASE_ID not set — skipping KB search"
@@ -90,9 +133,7 @@ def _search_knowledge_base(query: str) -> list[dict]:
         return []
 
     try:
-        bedrock_agent = boto3.client("bedrock-agent-runtime", region_name=AWS_REGION)
-
-        response = bedrock_agent.retrieve(
+        response = bedrock_agent_runtime().retrieve(
             knowledgeBaseId=KNOWLEDGE_BASE_ID,
             retrievalQuery={"text": query},
             retrievalConfiguration={
@@ -138,12 +179,10 @@ def _parse_runbook_metadata(content: str, result: dict) -> dict:
     2. S3 URI filename fallback
     3. H1 heading fallback
     """
-    import re
-
-    comment_match = re.search(
-        r"<!--\s*iq:runbook_id=([^\s|]+)\s*\|\s*title=([^|]+?)\s*\|\s*first_action_step=(.+?)\s*-->",
-        content,
-        re.DOTALL,
+    # Most KB chunks are not the top of the file — skip the regex scan unless
+    # the marker is actually there
+    comment_match = (
+        _METADATA_COMMENT_RE.search(content) if "iq:runbook_id=" in content else None
     )
     if comment_match:
         return {
@@ -155,15 +194,18 @@ def _parse_runbook_metadata(content: str, result: dict) -> dict:
     uri = result.get("location", {}).get("s3Location", {}).get("uri", "")
     runbook_id = "unknown"
     if uri:
-        filename = uri.split("/")[-1].replace(".md", "")
-        id_match = re.match(r"(RB-\d+)", filename)
+        filename = uri.rpartition("/")[2].removesuffix(".md")
+        id_match = _RUNBOOK_ID_RE.match(filename)
         if id_match:
             runbook_id = id_match.group(1)
 
     section = "General"
-    h1_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
-    if h1_match:
-        section = h1_match.group(1).strip()
+    if content.startswith("# "):
+        section = content[2:].partition("\n")[0].strip() or section
+    elif "#" in content:
+        h1_match = _H1_RE.search(content)
+        if h1_match:
+            section = h1_match.group(1).strip()
 
     return {
         "runbook_id": runbook_id,
@@ -173,28 +215,32 @@ def _parse_runbook_metadata(content: str, result: dict) -> dict:
 
 
 def _get_demo_runbook_hits(blast_radius: list[str]) -> list[dict]:
-    return [
-        {
-            "runbook_id": "RB-0042",
-            "section": "Payment Gateway Timeout Recovery",
-            "snippet": (
-                "When payment-service reports elevated timeout errors, immediately check the "
-                "gateway configuration for recent changes. Roll back any timeout/retry config "
-                "changes deployed in the last 6 hours."
-            ),
-            "relevance": 0.94,
-            "source_uri": "s3://incidentiq-runbooks/payments/gateway-timeout-recovery.md",
-            "first_action_step": "Check payment gateway config for recent changes and roll back if needed.",
-        },
-        {
-            "runbook_id": "RB-0018",
-            "section": "High Error Rate — General Escalation",
-            "snippet": (
-                "For HIGH severity incidents with >5% error rate: (1) Page on-call lead immediately. "
-                "(2) Enable enhanced logging on affected services. (3) Check recent deploys."
-            ),
-            "relevance": 0.78,
-            "source_uri": "s3://incidentiq-runbooks/general/high-error-rate-escalation.md",
-            "first_action_step": "Page on-call lead and enable enhanced logging on affected services.",
-        },
-    ]
+    return list(_DEMO_RUNBOOK_HITS)
+
+
+# Fallback when the KB returns nothing. Shared, so treat as read-only.
+_DEMO_RUNBOOK_HITS = (
+    {
+        "runbook_id": "RB-0042",
+        "section": "Payment Gateway Timeout Recovery",
+        "snippet": (
+            "When payment-service reports elevated timeout errors, immediately check the "
+            "gateway configuration for recent changes. Roll back any timeout/retry config "
+            "changes deployed in the last 6 hours."
+        ),
+        "relevance": 0.94,
+        "source_uri": "s3://incidentiq-runbooks/payments/gateway-timeout-recovery.md",
+        "first_action_step": "Check payment gateway config for recent changes and roll back if needed.",
+    },
+    {
+        "runbook_id": "RB-0018",
+        "section": "High Error Rate — General Escalation",
+        "snippet": (
+            "For HIGH severity incidents with >5% error rate: (1) Page on-call lead immediately. "
+            "(2) Enable enhanced logging on affected services. (3) Check recent deploys."
+        ),
+        "relevance": 0.78,
+        "source_uri": "s3://incidentiq-runbooks/general/high-error-rate-escalation.md",
+        "first_action_step": "Page on-call lead and enable enhanced logging on affected services.",
+    },
+)
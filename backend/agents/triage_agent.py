@@ -13,70 +13,225 @@ Output: severity, blast_radius, triage_summary_snippet → DynamoDB
 
 from __future__ import annotations
 
-import json
 import logging
 import os
+import re
+from typing import Optional
 
-import boto3
+import orjson
 
-from backend.models.incident import append_action_log, get_incident, update_incident
+from backend.integrations.aws import bedrock_runtime
+from backend.integrations.bedrock import invoke_nova_tool, nova_tool_config
+from backend.models.incident import (
+    action_log_entry,
+    get_incident,
+    update_and_append,
+)
 
 logger = logging.getLogger(__name__)
 
 NOVA_LITE_MODEL = "us.amazon.nova-lite-v1:0"
+# Triage is on the critical path of every incident. Point this at a model with
+# latency-optimized inference (e.g. us.amazon.nova-pro-v1:0) to use it —
+# the bedrock helpers route it there when BEDROCK_LATENCY_OPTIMIZED allows.
+TRIAGE_MODEL = os.environ.get("TRIAGE_MODEL_ID", NOVA_LITE_MODEL)
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 
+MAX_PROMPT_COMMIT_MESSAGES = 10
 
-def run_triage(incident_id: str) -> dict:
-    """Main entry point. Returns triage result dict."""
-    logger.info(f"[triage_agent] Starting triage for {incident_id}")
-    append_action_log(incident_id, "triage_agent", "agent_start", {})
+# Pushes that only touch these paths are LOW without asking Nova, unless a
+# commit message carries one of the risk keywords (see _fast_classify)
+_LOW_RISK_DIRS = ("docs/", "doc/", "tests/", "test/", "__tests__/", ".github/")
+_LOW_RISK_SUFFIXES = (".md", ".rst")
+_LOW_RISK_NAME_MARKERS = (".test.", ".spec.")
+_RISK_KEYWORDS = frozenset(
+    {"fix", "hotfix", "patch", "revert", "urgent", "payment", "auth", "security"}
+)
+_WORD_RE = re.compile(r"[a-z]+")
 
-    incident = get_incident(incident_id)
-    alert_payload = incident.get("alert_payload", {})
-    alert_source = incident.get("alert_source", "CloudWatch")
-    repo_id = incident.get("repo_id", "")
+# Severities the incident record accepts
+_SEVERITIES = frozenset({"HIGH", "MED", "LOW"})
 
-    # Load stored repo analysis (blast radius, tech stack, DAU)
-    repo_analysis = _load_repo_analysis(repo_id)
 
-    # Build context
+# ─── Static prompt prefix ─────────────────────────────────────────────────────
+# Identical for every incident of a source and sent ahead of the incident
+# details, so Bedrock can serve it from the prompt cache
+# (see backend.integrations.bedrock). Each source has its own system prompt —
+# one cached prefix per path, carrying only the rules that path needs.
+
+GITHUB_SYSTEM_PROMPT = """You are an expert SRE analyzing a production incident triggered by a GitHub push.
+Assess severity and identify affected services (blast radius).
+
+Assess risk based on:
+- Files changed (payment/, auth/, config/, database/ = high risk)
+- Commit message keywords (fix, hotfix, patch, revert, urgent = higher risk)
+- Config/dependency changes = higher risk
+- Core service files vs docs/tests (service code = higher risk)
+
+Severity levels:
+- HIGH: Payment/auth service changes, config changes in critical paths, database migrations
+- MED: Service code changes with moderate blast radius, dependency updates
+- LOW: Tests, docs, non-critical services, frontend-only changes
+
+When listing blast_radius, include:
+1. The directly affected service (infer from repo name and files changed)
+2. Any known downstream dependencies that would be impacted
+3. Only include services that would ACTUALLY be affected by this specific change
+
+Report your assessment by calling the triage_result tool."""
+
+CLOUDWATCH_SYSTEM_PROMPT = """You are an expert SRE analyzing a production incident raised by a monitoring alarm.
+Assess severity and identify affected services (blast radius).
+
+Assess risk based on:
+- The alarm's metric (error rate, 5xx, latency, throttling on user-facing services = higher risk)
+- How far past its threshold the metric is (see the state reason)
+- The service the namespace and dimensions point at (payment, auth, database = high risk)
+
+Severity levels:
+- HIGH: User-facing errors or outages, payment/auth/database degradation
+- MED: Elevated latency or errors with moderate blast radius, degraded internal services
+- LOW: Non-critical services, capacity warnings, background jobs
+
+When listing blast_radius, include:
+1. The directly affected service (infer from the alarm name, namespace and dimensions)
+2. Any known downstream dependencies that would be impacted
+3. Only include services that would ACTUALLY be affected by this alarm
+
+Report your assessment by calling the triage_result tool."""
+
+TRIAGE_INSTRUCTIONS = """Analyze the production incident trigger described below.
+Identify severity, blast radius (which services are affected), and a one-sentence summary.
+Use the known service dependencies to inform your blast radius — don't just guess from names."""
+
+# Forced tool call — Nova returns the assessment as an object of this shape
+TRIAGE_TOOL = nova_tool_config(
+    "triage_result",
+    "Record the severity and blast radius assessment for the incident.",
+    {
+        "type": "object",
+        "properties": {
+            "severity": {"type": "string", "enum": ["HIGH", "MED", "LOW"]},
+            "blast_radius": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Services affected by this specific change.",
+            },
+            "triage_summary_snippet": {
+                "type": "string",
+                "description": "One sentence: what changed and why it could cause issues.",
+            },
+            "reasoning": {
+                "type": "string",
+                "description": "Brief explanation of severity classification.",
+            },
+        },
+        "required": [
+            "severity",
+            "blast_radius",
+            "triage_summary_snippet",
+            "reasoning",
+        ],
+    },
+)
+
+
+def run_triage(
+    incident_id: str,
+    alert_payload: Optional[dict] = None,
+    alert_source: Optional[str] = None,
+    repo_id: Optional[str] = None,
+) -> dict:
+    """
+    Main entry point. Returns triage result dict.
+
+    Callers that just created the incident can pass its alert_payload,
+    alert_source and repo_id to skip re-reading it from DynamoDB. Callers
+    that already know the source can go straight to run_triage_github or
+    run_triage_cloudwatch.
+    """
+    if alert_payload is None or alert_source is None:
+        incident = get_incident(incident_id)
+        alert_payload = incident.get("alert_payload", {})
+        alert_source = incident.get("alert_source", "CloudWatch")
+        repo_id = incident.get("repo_id", "")
+
     if alert_source == "GitHub":
-        context = _build_github_context(alert_payload)
+        return run_triage_github(incident_id, alert_payload, repo_id or "")
+    return run_triage_cloudwatch(
+        incident_id, alert_payload, repo_id or "", alert_source=alert_source
+    )
+
+
+def run_triage_github(incident_id: str, alert_payload: dict, repo_id: str) -> dict:
+    """Triage a GitHub push incident. Returns triage result dict."""
+    logger.info("[triage_agent] Starting GitHub triage for %s", incident_id)
+    # Logged with the results in one write at the end, stamped with the real start
+    started = action_log_entry("triage_agent", "agent_start", {})
+
+    context = _build_github_context(alert_payload)
+    triage_result = _fast_classify(alert_payload, context)
+
+    if triage_result is not None:
+        logger.info("[triage_agent] Docs/tests-only push — classified without Nova")
     else:
-        context = _build_cloudwatch_context(alert_payload)
+        # Load stored repo analysis (blast radius, tech stack, DAU)
+        repo_analysis = _load_repo_analysis(repo_id)
+        triage_result = _call_nova_triage(
+            GITHUB_SYSTEM_PROMPT, alert_payload, context, "GitHub", repo_analysis
+        )
+
+    return _complete_triage(incident_id, triage_result, started)
+
 
-    # Call Nova with real service dependency context
+def run_triage_cloudwatch(
+    incident_id: str,
+    alert_payload: dict,
+    repo_id: str = "",
+    alert_source: str = "CloudWatch",
+) -> dict:
+    """Triage an alarm-style incident (CloudWatch, Replay, Manual)."""
+    logger.info("[triage_agent] Starting %s triage for %s", alert_source, incident_id)
+    started = action_log_entry("triage_agent", "agent_start", {})
+
+    context = _build_cloudwatch_context(alert_payload)
+    repo_analysis = _load_repo_analysis(repo_id)
     triage_result = _call_nova_triage(
-        alert_payload, context, alert_source, repo_analysis
+        CLOUDWATCH_SYSTEM_PROMPT, alert_payload, context, alert_source, repo_analysis
     )
 
-    # Write to DynamoDB
-    update_incident(
-        incident_id,
-        {
-            "severity": triage_result["severity"],
-            "blast_radius": triage_result["blast_radius"],
-            "triage_summary_snippet": triage_result["triage_summary_snippet"],
-        },
+    return _complete_triage(incident_id, triage_result, started)
+
+
+def _complete_triage(incident_id: str, triage_result: dict, started: dict) -> dict:
+    _write_triage_result(incident_id, triage_result, started)
+
+    logger.info(
+        "[triage_agent] Complete — severity=%s, blast_radius=%s",
+        triage_result["severity"],
+        triage_result["blast_radius"],
     )
+    return triage_result
+
+
+def _write_triage_result(incident_id: str, triage_result: dict, started: dict) -> None:
+    """Triage fields + agent_start/triage_complete log entries, one UpdateItem."""
+    details = {
+        "severity": triage_result["severity"],
+        "blast_radius": triage_result["blast_radius"],
+    }
 
-    append_action_log(
+    update_and_append(
         incident_id,
-        "triage_agent",
-        "triage_complete",
         {
             "severity": triage_result["severity"],
             "blast_radius": triage_result["blast_radius"],
+            "triage_summary_snippet": triage_result["triage_summary_snippet"],
         },
+        started,
+        action_log_entry("triage_agent", "triage_complete", details),
     )
 
-    logger.info(
-        f"[triage_agent] Complete — severity={triage_result['severity']}, "
-        f"blast_radius={triage_result['blast_radius']}"
-    )
-    return triage_result
-
 
 def _load_repo_analysis(repo_id: str) -> dict:
     """
@@ -99,7 +254,7 @@ def _load_repo_analysis(repo_id: str) -> dict:
             "estimated_dau": config.get("estimated_dau", 0),
         }
     except Exception as e:
-        logger.warning(f"[triage_agent] Could not load repo analysis: {e}")
+        logger.warning("[triage_agent] Could not load repo analysis: %s", e)
         return {}
 
 
@@ -108,13 +263,13 @@ def _build_github_context(payload: dict) -> dict:
     head_commit = payload.get("head_commit", {})
     all_commits = payload.get("all_commits", [])
 
-    all_modified = []
-    all_added = []
-    all_removed = []
+    all_modified = set()
+    all_added = set()
+    all_removed = set()
     for commit in all_commits:
-        all_modified.extend(commit.get("modified", []))
-        all_added.extend(commit.get("added", []))
-        all_removed.extend(commit.get("removed", []))
+        all_modified.update(commit.get("modified", ()))
+        all_added.update(commit.get("added", ()))
+        all_removed.update(commit.get("removed", ()))
 
     return {
         "trigger_type": "github_push",
@@ -124,11 +279,11 @@ def _build_github_context(payload: dict) -> dict:
         "head_commit_message": head_commit.get("message", ""),
         "head_commit_sha": head_commit.get("id", ""),
         "head_commit_author": head_commit.get("author", "unknown"),
-        "commit_count": len(all_commits),
-        "files_modified": list(set(all_modified))[:20],
-        "files_added": list(set(all_added))[:10],
-        "files_removed": list(set(all_removed))[:10],
-        "total_files_changed": len(set(all_modified + all_added + all_removed)),
+        "commit_count": payload.get("commit_count", len(all_commits)),
+        "files_modified": list(all_modified)[:20],
+        "files_added": list(all_added)[:10],
+        "files_removed": list(all_removed)[:10],
+        "total_files_changed": len(all_modified | all_added | all_removed),
     }
 
 
@@ -145,16 +300,100 @@ def _build_cloudwatch_context(payload: dict) -> dict:
     }
 
 
+def _is_low_risk_path(path: str) -> bool:
+    name = path.rpartition("/")[2]
+    return (
+        path.startswith(_LOW_RISK_DIRS)
+        or any(f"/{d}" in path for d in _LOW_RISK_DIRS)
+        or name.endswith(_LOW_RISK_SUFFIXES)
+        or name.startswith("test_")
+        or any(marker in name for marker in _LOW_RISK_NAME_MARKERS)
+    )
+
+
+def _fast_classify(payload: dict, context: dict) -> Optional[dict]:
+    """
+    Rule-based triage for pushes that can't break production: every changed
+    file is docs/tests/CI and no commit message mentions a risk keyword.
+    Returns a triage result, or None to fall through to Nova.
+    """
+    # Commits past the alert cap were never copied in — their files are unseen
+    if payload.get("commits_truncated"):
+        return None
+
+    files = {
+        *context["files_modified"],
+        *context["files_added"],
+        *context["files_removed"],
+    }
+    # The context lists are capped — only decide when every file is visible
+    if not files or len(files) != context["total_files_changed"]:
+        return None
+    if not all(_is_low_risk_path(path) for path in files):
+        return None
+
+    messages = [commit.get("message", "") for commit in payload.get("all_commits", [])]
+    messages.append(context["head_commit_message"])
+    for message in messages:
+        if not _RISK_KEYWORDS.isdisjoint(_WORD_RE.findall(message.lower())):
+            return None
+
+    service = context["repo"].rpartition("/")[2]
+    return {
+        "severity": "LOW",
+        "blast_radius": [service] if service and service != "unknown" else [],
+        "triage_summary_snippet": (
+            f"Push of {len(files)} docs/test/CI file(s) to "
+            f"{context['branch'] or 'an unknown branch'} — no runtime code changed."
+        ),
+        "reasoning": "Only documentation, test or CI files changed (rule-based).",
+    }
+
+
+def _slim_payload(payload: dict, alert_source: str) -> dict:
+    """
+    The parts of the raw alert worth sending to Nova next to the extracted
+    context. URLs, emails, full SHAs and per-file lists are either unused or
+    already summarised in the context.
+    """
+    if alert_source == "GitHub":
+        head_commit = payload.get("head_commit", {})
+        all_commits = payload.get("all_commits", [])
+        return {
+            "ref": payload.get("ref", ""),
+            "repo_id": payload.get("repo_id", ""),
+            "pusher": payload.get("pusher", "unknown"),
+            "head_commit": {
+                "id": head_commit.get("id", ""),
+                "message": head_commit.get("message", ""),
+                "author": head_commit.get("author", "unknown"),
+            },
+            "commit_count": payload.get("commit_count", len(all_commits)),
+            # First lines only — keywords like hotfix/revert feed the severity call
+            "commit_messages": [
+                commit.get("message", "").partition("\n")[0]
+                for commit in all_commits[:MAX_PROMPT_COMMIT_MESSAGES]
+            ],
+        }
+
+    return {
+        "AlarmName": payload.get("AlarmName", ""),
+        "Trigger": payload.get("Trigger", {}),
+        "NewStateReason": payload.get("NewStateReason", ""),
+    }
+
+
 def _call_nova_triage(
+    system_prompt: str,
     alert_payload: dict,
     context: dict,
     alert_source: str,
     repo_analysis: dict,
 ) -> dict:
     """Call Nova 2 Lite to classify severity and blast radius."""
-    bedrock = boto3.client("bedrock-runtime", region_name=AWS_REGION)
+    bedrock = bedrock_runtime()
 
-    # Format the known service dependency graph for Nova
+    # Per-incident facts only — the rules live in the cached static prefix
     known_dependencies = repo_analysis.get("service_dependencies", [])
     tech_stack = repo_analysis.get("tech_stack", [])
 
@@ -166,76 +405,46 @@ This service calls or depends on: {', '.join(known_dependencies)}
 When this service has an incident, these downstream services are also potentially affected.
 """
 
-    system_prompt = f"""You are an expert SRE analyzing a production incident.
-Assess severity and identify affected services (blast radius).
-
-For GitHub push triggers, assess risk based on:
-- Files changed (payment/, auth/, config/, database/ = high risk)
-- Commit message keywords (fix, hotfix, patch, revert, urgent = higher risk)
-- Config/dependency changes = higher risk
-- Core service files vs docs/tests (service code = higher risk)
-
-Severity levels:
-- HIGH: Payment/auth service changes, config changes in critical paths, database migrations
-- MED: Service code changes with moderate blast radius, dependency updates
-- LOW: Tests, docs, non-critical services, frontend-only changes
-
-{dependency_context}
-
-When listing blast_radius, include:
-1. The directly affected service (infer from repo name and files changed)
-2. Any known downstream dependencies that would be impacted
-3. Only include services that would ACTUALLY be affected by this specific change
-
-Respond with ONLY valid JSON, no markdown:
-{{
-  "severity": "HIGH|MED|LOW",
-  "blast_radius": ["service-name-1", "service-name-2"],
-  "triage_summary_snippet": "One sentence: what changed and why it could cause issues.",
-  "reasoning": "Brief explanation of severity classification."
-}}"""
-
-    user_message = f"""Analyze this production incident trigger:
-
-SOURCE: {alert_source}
+    user_message = f"""SOURCE: {alert_source}
 TECH STACK: {', '.join(tech_stack) if tech_stack else 'Unknown'}
-
+{dependency_context}
 ALERT PAYLOAD:
-{json.dumps(alert_payload, indent=2, default=str)}
+{orjson.dumps(_slim_payload(alert_payload, alert_source), default=str).decode()}
 
 EXTRACTED CONTEXT:
-{json.dumps(context, indent=2, default=str)}
-
-Identify severity, blast radius (which services are affected), and a one-sentence summary.
-Use the known service dependencies to inform your blast radius — don't just guess from filenames.
-Respond with ONLY the JSON object."""
-
-    response = bedrock.invoke_model(
-        modelId=NOVA_LITE_MODEL,
-        body=json.dumps(
-            {
-                "messages": [{"role": "user", "content": [{"text": user_message}]}],
-                "system": [{"text": system_prompt}],
-                "inferenceConfig": {"maxTokens": 512, "temperature": 0.1},
-            }
-        ),
-        contentType="application/json",
-        accept="application/json",
+{orjson.dumps(context, default=str).decode()}"""
+
+    result = invoke_nova_tool(
+        bedrock,
+        TRIAGE_MODEL,
+        system_prompt,
+        user_message,
+        TRIAGE_TOOL,
+        max_tokens=512,
+        temperature=0.1,
+        static_instructions=TRIAGE_INSTRUCTIONS,
     )
+    return _normalize_triage_result(result)
+
 
-    response_body = json.loads(response["body"].read())
-    raw_text = response_body["output"]["message"]["content"][0]["text"].strip()
+def _normalize_triage_result(result: dict) -> dict:
+    # The tool schema constrains these, but a plain-text answer (parsed by
+    # invoke_nova_tool's fallback) can carry anything — clamp before writing
+    severity = result.get("severity")
+    if isinstance(severity, str):
+        severity = severity.strip().upper()
+    if severity not in _SEVERITIES:
+        severity = "MED"
 
-    if raw_text.startswith("```"):
-        raw_text = raw_text.split("```")[1]
-        if raw_text.startswith("json"):
-            raw_text = raw_text[4:]
-        raw_text = raw_text.strip()
+    blast_radius = result.get("blast_radius")
+    if isinstance(blast_radius, str):
+        blast_radius = [blast_radius]
+    elif not isinstance(blast_radius, list):
+        blast_radius = []
 
-    result = json.loads(raw_text)
     return {
-        "severity": result.get("severity", "MED"),
-        "blast_radius": result.get("blast_radius", []),
+        "severity": severity,
+        "blast_radius": [str(service) for service in blast_radius if service],
         "triage_summary_snippet": result.get(
             "triage_summary_snippet", "Incident detected."
         ),
@@ -11,36 +11,46 @@ Changes from V2:
 
 from __future__ import annotations
 
+import asyncio
+import gzip
 import hashlib
 import hmac
-import json
 import logging
 import os
-import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
 
+import httpx
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
+from backend.integrations.aws import s3
 from backend.models.incident import (
     create_incident,
     get_incident,
     list_recent_incidents,
     resolve_incident,
+    action_log_entry,
     append_action_log,
-    update_incident,
+    update_and_append,
 )
 from backend.models.repo import (
     create_repo_config,
     get_repo_config,
     get_repo_config_by_url,
+    get_repo_slack_target,
     list_repos,
     delete_repo_config,
     increment_incident_count,
@@ -60,11 +70,165 @@ logger = logging.getLogger(__name__)
 GITHUB_WEBHOOK_SECRET = os.environ.get(
     "GITHUB_WEBHOOK_SECRET", "incidentiq-webhook-secret"
 )
+# Keyed once — each webhook copies it instead of re-deriving the HMAC pads
+_WEBHOOK_HMAC = hmac.new(
+    GITHUB_WEBHOOK_SECRET.encode("utf-8"), digestmod=hashlib.sha256
+)
+
+GITHUB_API_URL = "https://api.github.com"
+
+# Commits copied into the incident record — the newest ones, ending at the
+# head commit. A push webhook can carry up to 2048 commits, so the cap keeps
+# large pushes within DynamoDB's 400 KB item limit; commit_count keeps the
+# real total.
+MAX_ALERT_COMMITS = 20
+
+# Pushes to any other branch are ignored
+_DEFAULT_BRANCHES = frozenset({"main", "master"})
+
+# Threads for incident pipelines. Each run blocks on Bedrock for tens of
+# seconds, so the interpreter default (cpu + 4) queues pushes behind each other.
+PIPELINE_WORKERS = int(os.environ.get("PIPELINE_WORKERS", "64"))
+
+# Strong refs to in-flight pipeline tasks — the event loop only keeps weak ones
+_pipeline_tasks: set[asyncio.Task] = set()
+
+# One keep-alive client for GitHub API calls made from request handlers, so
+# onboard/disconnect reuse a warm TLS connection instead of a fresh handshake
+_github_http: Optional[httpx.AsyncClient] = None
+
+
+def _github_client() -> httpx.AsyncClient:
+    global _github_http
+    if _github_http is None:
+        _github_http = httpx.AsyncClient(
+            base_url=GITHUB_API_URL,
+            # api.github.com speaks HTTP/2 — concurrent onboards share one
+            # connection as multiplexed streams
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+            timeout=10.0,
+            headers=_GITHUB_STATIC_HEADERS,
+        )
+    return _github_http
+
+
+_GITHUB_STATIC_HEADERS = {
+    "Accept": "application/vnd.github.v3+json",
+    "Content-Type": "application/json",
+    "User-Agent": "IncidentIQ/2.0",
+}
+
+
+@lru_cache(maxsize=64)
+def _github_auth(github_token: str) -> dict:
+    """Per-token Authorization header; the rest are client defaults. Read-only."""
+    return {"Authorization": f"token {github_token}"}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=PIPELINE_WORKERS, thread_name_prefix="pipeline")
+    )
+    _github_client()
+    yield
+    if _github_http is not None:
+        await _github_http.aclose()
+
+
+class GitHubSigMiddleware:
+    """
+    Verifies X-Hub-Signature-256 on GitHub webhook POSTs before FastAPI
+    routing runs. Bad or missing signatures get a 401 straight from here, so
+    unsigned traffic never reaches the handler. Requests without a header are
+    let through only when VERIFY_WEBHOOK_SIGNATURE=false.
+    """
+
+    def __init__(self, app, path: str = "/api/webhook/github"):
+        self.app = app
+        self.path = path
+        self.required = (
+            os.environ.get("VERIFY_WEBHOOK_SIGNATURE", "true").lower() != "false"
+        )
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"] != self.path
+            or scope["method"] != "POST"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        signature = None
+        for name, value in scope["headers"]:
+            if name == b"x-hub-signature-256":
+                signature = value.decode("latin-1")
+                break
+
+        if signature is None and not self.required:
+            await self.app(scope, receive, send)
+            return
+        # Malformed or missing — reject without reading the body at all
+        if not signature or not signature.startswith("sha256="):
+            await self._reject(send)
+            return
+
+        # Hash while reading — one pass over the payload
+        mac = _WEBHOOK_HMAC.copy()
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            mac.update(chunk)
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+
+        if not hmac.compare_digest(mac.hexdigest(), signature[len("sha256=") :]):
+            await self._reject(send)
+            return
+
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if replayed:
+                return await receive()
+            replayed = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, replay, send)
+
+    @staticmethod
+    async def _reject(send) -> None:
+        logger.warning("[webhook] Invalid signature — rejecting request")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 401,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": b'{"detail":"Invalid webhook signature"}',
+            }
+        )
+
 
 app = FastAPI(
     title="IncidentIQ API",
     description="Autonomous Incident Response — connect any GitHub repo",
     version="3.0.0",
+    lifespan=lifespan,
+    # The dashboard polls the incident list every few seconds
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -74,25 +238,37 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GitHubSigMiddleware)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Request models
 # ─────────────────────────────────────────────────────────────────────────────
+# The GitHub webhook deliberately has no model — it reads the raw body.
+
 
+class _RequestModel(BaseModel):
+    # Request bodies are read, never modified; unknown keys are dropped
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
-class OnboardRequest(BaseModel):
+
+class OnboardRequest(_RequestModel):
     github_url: str
     slack_webhook_url: str
     github_token: str
 
 
-class ResolveRequest(BaseModel):
+class ResolveRequest(_RequestModel):
     incident_id: str
     resolution_notes: Optional[str] = None  # What the engineer did to fix it
 
 
-class ReplayRequest(BaseModel):
+class IngestRequest(_RequestModel):
+    alert_payload: dict
+    alert_source: str = "CloudWatch"
+
+
+class ReplayRequest(_RequestModel):
     payload_name: str = "payments_service_high"
     custom_payload: dict | None = None
 
@@ -113,7 +289,7 @@ def health():
 
 
 @app.post("/api/onboard")
-def onboard_repo(request: OnboardRequest, background_tasks: BackgroundTasks):
+async def onboard_repo(request: OnboardRequest, background_tasks: BackgroundTasks):
     """
     Connect a GitHub repo.
     1. Register GitHub webhook
@@ -123,11 +299,11 @@ def onboard_repo(request: OnboardRequest, background_tasks: BackgroundTasks):
     repo_id = _url_to_repo_id(request.github_url)
     logger.info(f"[onboard] Connecting repo: {repo_id}")
 
-    existing = get_repo_config(repo_id)
+    existing = await run_in_threadpool(get_repo_config, repo_id)
     if existing:
         logger.info(f"[onboard] Repo already connected — updating config")
 
-    webhook_id = _register_github_webhook(
+    webhook_id = await _register_github_webhook(
         repo_id=repo_id,
         github_token=request.github_token,
     )
@@ -138,7 +314,8 @@ def onboard_repo(request: OnboardRequest, background_tasks: BackgroundTasks):
             detail="Failed to register GitHub webhook. Check that your token has 'repo' and 'admin:repo_hook' scopes.",
         )
 
-    config = create_repo_config(
+    config = await run_in_threadpool(
+        create_repo_config,
         github_url=request.github_url,
         slack_webhook_url=request.slack_webhook_url,
         github_webhook_id=webhook_id,
@@ -191,20 +368,20 @@ def _run_repo_analysis(repo_id: str, github_token: str) -> None:
 
 
 @app.delete("/api/repos/{repo_id:path}")
-def disconnect_repo(repo_id: str):
+async def disconnect_repo(repo_id: str):
     """Disconnect a repo — removes GitHub webhook and DynamoDB config."""
-    config = get_repo_config(repo_id)
+    config = await run_in_threadpool(get_repo_config, repo_id)
     if not config:
         raise HTTPException(status_code=404, detail="Repo not connected")
 
     if config.get("github_webhook_id") and config.get("github_token"):
-        _deregister_github_webhook(
+        await _deregister_github_webhook(
             repo_id=repo_id,
             webhook_id=config["github_webhook_id"],
             github_token=config["github_token"],
         )
 
-    delete_repo_config(repo_id)
+    await run_in_threadpool(delete_repo_config, repo_id)
     logger.info(f"[disconnect] Repo disconnected: {repo_id}")
     return {"repo_id": repo_id, "status": "disconnected"}
 
@@ -212,11 +389,8 @@ def disconnect_repo(repo_id: str):
 @app.get("/api/repos")
 def get_repos():
     """List all connected repos. Includes analysis_status for dashboard."""
-    repos = list_repos()
-    safe_repos = [
-        {k: v for k, v in r.items() if k not in ("github_token",)} for r in repos
-    ]
-    return {"repos": safe_repos, "count": len(safe_repos)}
+    repos = list_repos(include_token=False)
+    return {"repos": repos, "count": len(repos)}
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -227,37 +401,29 @@ def get_repos():
 @app.post("/api/webhook/github")
 async def github_webhook(
     request: Request,
-    background_tasks: BackgroundTasks,
     x_github_event: str = Header(None),
-    x_hub_signature_256: str = Header(None),
 ):
     """
-    Receives GitHub push events.
+    Receives GitHub push events (signature already checked by GitHubSigMiddleware).
     Runs push_filter before creating incident — only pages on risky pushes.
     """
-    body = await request.body()
-
-    if not _verify_github_signature(body, x_hub_signature_256):
-        logger.warning("[webhook] Invalid signature — rejecting request")
-        raise HTTPException(status_code=401, detail="Invalid webhook signature")
-
     if x_github_event != "push":
         logger.info(f"[webhook] Ignoring event: {x_github_event}")
         return {"status": "ignored", "event": x_github_event}
 
-    payload = json.loads(body)
+    payload = _narrow_push_payload(orjson.loads(await request.body()))
 
     repo_id = parse_webhook_repo_id(payload)
     if not repo_id:
         return {"status": "ignored", "reason": "no repo_id"}
 
-    repo_config = get_repo_config(repo_id)
-    if not repo_config:
+    slack_target = get_repo_slack_target(repo_id)
+    if slack_target is None:
         logger.warning(f"[webhook] Push from unregistered repo: {repo_id}")
         return {"status": "ignored", "reason": "repo not connected"}
 
     ref = payload.get("ref", "")
-    if not (ref.endswith("/main") or ref.endswith("/master")):
+    if ref.rpartition("/")[2] not in _DEFAULT_BRANCHES:
         return {"status": "ignored", "reason": f"non-default branch: {ref}"}
 
     commits = payload.get("commits", [])
@@ -305,18 +471,16 @@ async def github_webhook(
         commits=commits,
     )
 
-    incident_id = create_incident(
-        alert_payload=alert_payload,
-        alert_source="GitHub",
-        repo_id=repo_id,
-        slack_webhook_url=repo_config.get("slack_webhook_url"),
+    # The DynamoDB writes happen after the response — GitHub only needs the id
+    incident_id = str(uuid.uuid4())
+    _spawn_pipeline(
+        _ingest_push,
+        incident_id,
+        alert_payload,
+        repo_id,
+        slack_target[0],
     )
 
-    increment_incident_count(repo_id)
-    logger.info(f"[webhook] Incident created: {incident_id}")
-
-    background_tasks.add_task(_run_pipeline_safe, incident_id)
-
     return {
         "incident_id": incident_id,
         "status": "ingested",
@@ -331,18 +495,34 @@ async def github_webhook(
 # ─────────────────────────────────────────────────────────────────────────────
 
 
+@app.post("/api/ingest")
+async def ingest_alert(request: IngestRequest):
+    """Alarm relayed by the SQS ingest Lambda (backend/lambda/ingest_handler.py)."""
+    incident_id = await run_in_threadpool(
+        create_incident,
+        alert_payload=request.alert_payload,
+        alert_source=request.alert_source,
+    )
+    _spawn_pipeline(
+        _run_pipeline_safe, incident_id, request.alert_payload, request.alert_source
+    )
+    return {"incident_id": incident_id, "status": "ingested"}
+
+
 @app.post("/api/replay")
-def replay_incident(request: ReplayRequest, background_tasks: BackgroundTasks):
+async def replay_incident(request: ReplayRequest):
     payload = request.custom_payload or _load_replay_payload(request.payload_name)
-    incident_id = create_incident(alert_payload=payload, alert_source="Replay")
-    background_tasks.add_task(_run_pipeline_safe, incident_id)
+    incident_id = await run_in_threadpool(
+        create_incident, alert_payload=payload, alert_source="Replay"
+    )
+    _spawn_pipeline(_run_pipeline_safe, incident_id, payload, "Replay")
     return {"incident_id": incident_id, "status": "ingested"}
 
 
 @app.post("/api/resolve")
-def resolve(request: ResolveRequest, background_tasks: BackgroundTasks):
+async def resolve(request: ResolveRequest):
     try:
-        get_incident(request.incident_id)
+        await run_in_threadpool(get_incident, request.incident_id)
     except ValueError:
         raise HTTPException(status_code=404, detail="Incident not found")
 
@@ -350,17 +530,20 @@ def resolve(request: ResolveRequest, background_tasks: BackgroundTasks):
     extra_fields = {}
     if request.resolution_notes:
         extra_fields["resolution_notes"] = request.resolution_notes
-        append_action_log(
+        await run_in_threadpool(
+            append_action_log,
             request.incident_id,
             "api",
             "resolution_notes_added",
             {"notes_preview": request.resolution_notes[:120]},
         )
 
-    resolve_incident(request.incident_id, extra_fields=extra_fields)
+    await run_in_threadpool(
+        resolve_incident, request.incident_id, extra_fields=extra_fields
+    )
 
     # Run fix commit detection + postmortem in background
-    background_tasks.add_task(_run_resolve_pipeline, request.incident_id)
+    _spawn_pipeline(_run_resolve_pipeline, request.incident_id)
 
     return {"incident_id": request.incident_id, "status": "resolved"}
 
@@ -388,7 +571,9 @@ def get_postmortem(incident_id: str):
     s3_path = incident.get("postmortem_s3_path")
     if not s3_path:
         raise HTTPException(status_code=404, detail="Postmortem not yet generated")
-    content = _read_postmortem_from_s3(s3_path)
+    content = _read_postmortem_from_s3(
+        s3_path, incident.get("postmortem_generated_at", "")
+    )
     return {"incident_id": incident_id, "s3_path": s3_path, "content": content}
 
 
@@ -397,13 +582,13 @@ def get_postmortem(incident_id: str):
 # ─────────────────────────────────────────────────────────────────────────────
 
 
-def _register_github_webhook(repo_id: str, github_token: str) -> Optional[int]:
+async def _register_github_webhook(repo_id: str, github_token: str) -> Optional[int]:
     alb_url = os.environ.get(
         "PUBLIC_URL", "http://incidentiq-alb-1884683334.us-east-1.elb.amazonaws.com"
     )
     webhook_url = f"{alb_url}/api/webhook/github"
 
-    payload = json.dumps(
+    payload = orjson.dumps(
         {
             "name": "web",
             "active": True,
@@ -415,64 +600,59 @@ def _register_github_webhook(repo_id: str, github_token: str) -> Optional[int]:
                 "insecure_ssl": "0",
             },
         }
-    ).encode("utf-8")
+    )
 
     try:
-        req = urllib.request.Request(
-            f"https://api.github.com/repos/{repo_id}/hooks",
-            data=payload,
-            headers={
-                "Authorization": f"token {github_token}",
-                "Accept": "application/vnd.github.v3+json",
-                "Content-Type": "application/json",
-                "User-Agent": "IncidentIQ/2.0",
-            },
-            method="POST",
+        resp = await _github_client().post(
+            f"/repos/{repo_id}/hooks",
+            content=payload,
+            headers=_github_auth(github_token),
         )
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read())
-            return data.get("id")
-    except urllib.error.HTTPError as e:
-        body = e.read().decode()
-        logger.error(f"[onboard] GitHub webhook registration failed: {e.code} — {body}")
-        return None
     except Exception as e:
         logger.error(f"[onboard] GitHub webhook registration error: {e}")
         return None
 
+    if resp.status_code >= 400:
+        logger.error(
+            f"[onboard] GitHub webhook registration failed: "
+            f"{resp.status_code} — {resp.text}"
+        )
+        return None
+    return orjson.loads(resp.content).get("id")
+
 
-def _deregister_github_webhook(
+async def _deregister_github_webhook(
     repo_id: str, webhook_id: int, github_token: str
 ) -> None:
     try:
-        req = urllib.request.Request(
-            f"https://api.github.com/repos/{repo_id}/hooks/{webhook_id}",
-            headers={
-                "Authorization": f"token {github_token}",
-                "Accept": "application/vnd.github.v3+json",
-                "User-Agent": "IncidentIQ/2.0",
-            },
-            method="DELETE",
+        resp = await _github_client().delete(
+            f"/repos/{repo_id}/hooks/{webhook_id}",
+            headers=_github_auth(github_token),
         )
-        urllib.request.urlopen(req, timeout=10)
+        resp.raise_for_status()
     except Exception as e:
         logger.warning(f"[disconnect] Could not remove webhook {webhook_id}: {e}")
 
 
-def _verify_github_signature(body: bytes, signature_header: Optional[str]) -> bool:
-    if not signature_header:
-        if os.environ.get("VERIFY_WEBHOOK_SIGNATURE", "true").lower() == "false":
-            return True
-        return False
-    if not signature_header.startswith("sha256="):
-        return False
-    expected = hmac.new(
-        GITHUB_WEBHOOK_SECRET.encode("utf-8"),
-        body,
-        hashlib.sha256,
-    ).hexdigest()
-    actual = signature_header[len("sha256=") :]
-    return hmac.compare_digest(expected, actual)
+def _narrow_push_payload(payload: dict) -> dict:
+    """
+    Keep only the push fields the webhook path reads. The full event also
+    carries the repository, sender and organization objects (dozens of URL
+    fields each); dropping the reference here lets them be freed before the
+    push filter — which may wait on Nova — runs.
+    """
+    repository = payload.get("repository") or {}
+    narrowed = {
+        "ref": payload.get("ref", ""),
+        "before": payload.get("before", ""),
+        "after": payload.get("after", ""),
+        "repository": {"full_name": repository.get("full_name")},
+        "pusher": payload.get("pusher", {}),
+        "commits": payload.get("commits", []),
+    }
+    if "head_commit" in payload:
+        narrowed["head_commit"] = payload["head_commit"]
+    return narrowed
 
 
 def _build_alert_payload_from_push(
@@ -482,6 +662,29 @@ def _build_alert_payload_from_push(
     repo_id: str,
     commits: list[dict],
 ) -> dict:
+    head_id = head_commit.get("id", "")
+    head_short = head_id[:8]
+    head_message = head_commit.get("message", "")
+    head_summary = head_message[:100]
+    head_author = head_commit.get("author", {})
+    pusher_name = pusher.get("name", "unknown")
+
+    all_commits = []
+    for c in commits[-MAX_ALERT_COMMITS:]:
+        commit_id = c.get("id", "")
+        all_commits.append(
+            {
+                "id": commit_id[:8],
+                "full_sha": commit_id,
+                "message": c.get("message", ""),
+                "author": c.get("author", {}).get("name", "unknown"),
+                "timestamp": c.get("timestamp", ""),
+                "modified": c.get("modified", []),
+                "added": c.get("added", []),
+                "url": c.get("url", ""),
+            }
+        )
+
     return {
         "source": "GitHub",
         "repo_id": repo_id,
@@ -490,37 +693,25 @@ def _build_alert_payload_from_push(
         "before": payload.get("before", ""),
         "after": payload.get("after", ""),
         "head_commit": {
-            "id": head_commit.get("id", "")[:8],
-            "full_sha": head_commit.get("id", ""),
-            "message": head_commit.get("message", ""),
-            "author": head_commit.get("author", {}).get(
-                "name", pusher.get("name", "unknown")
-            ),
-            "author_email": head_commit.get("author", {}).get("email", ""),
+            "id": head_short,
+            "full_sha": head_id,
+            "message": head_message,
+            "author": head_author.get("name", pusher_name),
+            "author_email": head_author.get("email", ""),
             "timestamp": head_commit.get("timestamp", ""),
             "url": head_commit.get("url", ""),
             "added": head_commit.get("added", []),
             "removed": head_commit.get("removed", []),
             "modified": head_commit.get("modified", []),
         },
-        "all_commits": [
-            {
-                "id": c.get("id", "")[:8],
-                "full_sha": c.get("id", ""),
-                "message": c.get("message", ""),
-                "author": c.get("author", {}).get("name", "unknown"),
-                "timestamp": c.get("timestamp", ""),
-                "modified": c.get("modified", []),
-                "added": c.get("added", []),
-                "url": c.get("url", ""),
-            }
-            for c in commits
-        ],
-        "pusher": pusher.get("name", "unknown"),
+        "all_commits": all_commits,
+        "commit_count": len(commits),
+        "commits_truncated": len(commits) > MAX_ALERT_COMMITS,
+        "pusher": pusher_name,
         "AlarmName": f"github-push-{repo_id}",
-        "AlarmDescription": f"Push to {repo_id} by {pusher.get('name', 'unknown')}: {head_commit.get('message', '')[:100]}",
+        "AlarmDescription": f"Push to {repo_id} by {pusher_name}: {head_summary}",
         "NewStateValue": "ALARM",
-        "NewStateReason": f"Commit {head_commit.get('id', '')[:8]}: {head_commit.get('message', '')[:100]}",
+        "NewStateReason": f"Commit {head_short}: {head_summary}",
     }
 
 
@@ -529,9 +720,62 @@ def _build_alert_payload_from_push(
 # ─────────────────────────────────────────────────────────────────────────────
 
 
-def _run_pipeline_safe(incident_id: str):
+def _spawn_pipeline(fn, *args) -> None:
+    """
+    Run a blocking pipeline job on the default executor without holding up
+    the response. Unlike BackgroundTasks it is not tied to the request, so
+    the connection is released as soon as the response is sent.
+    """
+    task = asyncio.create_task(_run_in_thread(fn, *args))
+    _pipeline_tasks.add(task)
+    task.add_done_callback(_pipeline_tasks.discard)
+
+
+async def _run_in_thread(fn, *args) -> None:
+    try:
+        await asyncio.to_thread(fn, *args)
+    except Exception as e:
+        # The _safe wrappers log their own failures — this catches the rest
+        logger.error(f"[api] Background job {fn.__name__} failed: {e}")
+
+
+def _ingest_push(
+    incident_id: str,
+    alert_payload: dict,
+    repo_id: str,
+    slack_webhook_url: Optional[str],
+) -> None:
+    """Background task: write the incident, bump the repo counter, run the pipeline."""
+    try:
+        create_incident(
+            alert_payload=alert_payload,
+            alert_source="GitHub",
+            repo_id=repo_id,
+            slack_webhook_url=slack_webhook_url,
+            incident_id=incident_id,
+        )
+        increment_incident_count(repo_id)
+        logger.info(f"[webhook] Incident created: {incident_id}")
+    except Exception as e:
+        logger.error(f"[webhook] Could not create incident {incident_id}: {e}")
+        return
+
+    _run_pipeline_safe(incident_id, alert_payload, "GitHub", repo_id)
+
+
+def _run_pipeline_safe(
+    incident_id: str,
+    alert_payload: Optional[dict] = None,
+    alert_source: Optional[str] = None,
+    repo_id: Optional[str] = None,
+):
     try:
-        run_incident_pipeline(incident_id)
+        run_incident_pipeline(
+            incident_id,
+            alert_payload=alert_payload,
+            alert_source=alert_source,
+            repo_id=repo_id,
+        )
     except Exception as e:
         logger.error(f"[api] Pipeline failed for {incident_id}: {e}")
 
@@ -551,16 +795,18 @@ def _run_resolve_pipeline(incident_id: str):
         fix_commit = detect_fix_commit(incident)
 
         if fix_commit:
-            update_incident(incident_id, {"fix_commit": fix_commit})
-            append_action_log(
+            update_and_append(
                 incident_id,
-                "fix_detector",
-                "fix_commit_identified",
-                {
-                    "commit_hash": fix_commit["commit_hash"],
-                    "fix_description": fix_commit.get("fix_description", ""),
-                    "confidence": fix_commit.get("confidence", 0),
-                },
+                {"fix_commit": fix_commit},
+                action_log_entry(
+                    "fix_detector",
+                    "fix_commit_identified",
+                    {
+                        "commit_hash": fix_commit["commit_hash"],
+                        "fix_description": fix_commit.get("fix_description", ""),
+                        "confidence": fix_commit.get("confidence", 0),
+                    },
+                ),
             )
             logger.info(
                 f"[api] Fix commit identified: {fix_commit['commit_hash']} "
@@ -583,26 +829,39 @@ def _run_postmortem_safe(incident_id: str):
         logger.error(f"[api] Postmortem failed for {incident_id}: {e}")
 
 
+# Replay fixtures never change at runtime. The cached dict is shared between
+# calls — the pipeline only reads alert payloads, never mutates them.
+@lru_cache(maxsize=32)
 def _load_replay_payload(payload_name: str) -> dict:
     replay_dir = os.path.join(os.path.dirname(__file__), "..", "..", "replay")
     payload_path = os.path.join(replay_dir, f"{payload_name}.json")
     try:
-        with open(payload_path) as f:
-            return json.load(f)
+        with open(payload_path, "rb") as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         return {"AlarmName": "replay-fallback", "NewStateValue": "ALARM"}
 
 
-def _read_postmortem_from_s3(s3_path: str) -> str:
+def _read_postmortem_from_s3(s3_path: str, generated_at: str = "") -> str:
     if s3_path.startswith("local://"):
         return "# Postmortem\n\nLocal mode."
-    import boto3
-
     try:
-        s3 = boto3.client("s3", region_name=os.environ.get("AWS_REGION", "us-east-1"))
-        path_parts = s3_path.replace("s3://", "").split("/", 1)
-        bucket, key = path_parts[0], path_parts[1]
-        response = s3.get_object(Bucket=bucket, Key=key)
-        return response["Body"].read().decode("utf-8")
+        return _fetch_postmortem(s3_path, generated_at)
     except Exception as e:
+        # Raised out of the cached function, so failures are never cached
         return f"# Error\n\nCould not load postmortem: {e}"
+
+
+# The dashboard re-opens the same postmortems. A re-run overwrites the same S3
+# key but stamps a new postmortem_generated_at on the incident, which is part
+# of the cache key — so every worker picks up the new version on its next read.
+@lru_cache(maxsize=256)
+def _fetch_postmortem(s3_path: str, generated_at: str) -> str:
+    path_parts = s3_path.replace("s3://", "").split("/", 1)
+    bucket, key = path_parts[0], path_parts[1]
+    response = s3().get_object(Bucket=bucket, Key=key)
+    body = response["Body"].read()
+    # Postmortems are stored gzip-encoded; older ones are plain markdown
+    if response.get("ContentEncoding") == "gzip":
+        body = gzip.decompress(body)
+    return body.decode("utf-8")
@@ -0,0 +1,120 @@
+"""
+Shared boto3 clients.
+
+Building a boto3 client loads the service model, resolves credentials and
+endpoints and sets up a fresh connection pool — far too much work to repeat on
+every incident. Each client here is built once per process on first use and
+reused by every agent after that.
+
+boto3's default session is not safe to build clients from concurrently
+(investigation + runbook run in parallel threads), so construction is locked.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+
+import boto3
+from botocore.config import Config
+
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+
+# Keep connections to AWS endpoints warm between incidents and back off
+# adaptively when Bedrock throttles instead of failing the agent outright.
+# The pool is sized for concurrent incidents sharing one client across the
+# pipeline's worker threads (botocore's default is 10).
+# A regional endpoint that can't complete a handshake in 2s is better retried
+# than waited on; 30s between reads still covers a full non-streamed Nova
+# response (botocore's defaults are 60s for both).
+CLIENT_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 3},
+    connect_timeout=2,
+    read_timeout=30,
+)
+
+# Secrets rotate on the order of hours — five minutes of staleness is fine
+SECRET_TTL_SECONDS = 300
+
+_clients: dict[str, object] = {}
+_resources: dict[str, object] = {}
+_lock = threading.Lock()
+
+_secret_cache: dict[str, tuple[float, dict]] = {}
+
+
+def _client(service_name: str):
+    client = _clients.get(service_name)
+    if client is None:
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                client = boto3.client(
+                    service_name, region_name=AWS_REGION, config=CLIENT_CONFIG
+                )
+                _clients[service_name] = client
+    return client
+
+
+def _resource(service_name: str):
+    resource = _resources.get(service_name)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(service_name)
+            if resource is None:
+                resource = boto3.resource(
+                    service_name, region_name=AWS_REGION, config=CLIENT_CONFIG
+                )
+                _resources[service_name] = resource
+    return resource
+
+
+def bedrock_runtime():
+    """Shared bedrock-runtime client (Nova invoke_model)."""
+    return _client("bedrock-runtime")
+
+
+def bedrock_agent():
+    """Shared bedrock-agent client (Knowledge Base ingestion jobs)."""
+    return _client("bedrock-agent")
+
+
+def bedrock_agent_runtime():
+    """Shared bedrock-agent-runtime client (Knowledge Base retrieve)."""
+    return _client("bedrock-agent-runtime")
+
+
+def dynamodb():
+    """Shared DynamoDB service resource (Table objects hang off it)."""
+    return _resource("dynamodb")
+
+
+def s3():
+    """Shared S3 client."""
+    return _client("s3")
+
+
+def secrets_manager():
+    """Shared Secrets Manager client."""
+    return _client("secretsmanager")
+
+
+def get_secret(secret_id: str, ttl: float = SECRET_TTL_SECONDS) -> dict:
+    """
+    Fetch a JSON secret from Secrets Manager, parsed.
+    Served from memory for `ttl` seconds after each successful fetch.
+    Errors are not cached — they propagate to the caller.
+    """
+    cached = _secret_cache.get(secret_id)
+    now = time.monotonic()
+    if cached and now - cached[0] < ttl:
+        return cached[1]
+
+    response = secrets_manager().get_secret_value(SecretId=secret_id)
+    secret = json.loads(response["SecretString"])
+    _secret_cache[secret_id] = (now, secret)
+    return secret
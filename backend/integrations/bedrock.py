@@ -0,0 +1,324 @@
+"""
+Bedrock helpers shared by the Nova-backed agents.
+
+Builds the Nova InvokeModel request body and pulls the generated text back out.
+Static prompt prefixes (system prompt + fixed instructions) can be marked with a
+cachePoint so repeated incidents read them from Bedrock's prompt cache instead
+of re-prefilling the same tokens on every call.
+
+Models that offer latency-optimized inference get that instead. Bedrock rejects
+requests that combine the two, so each model is routed down exactly one path.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Iterator, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Set BEDROCK_LATENCY_OPTIMIZED=false in regions without latency-optimized capacity
+LATENCY_OPTIMIZED = (
+    os.environ.get("BEDROCK_LATENCY_OPTIMIZED", "true").lower() != "false"
+)
+
+# Models served with performanceConfigLatency="optimized".
+# Nova Lite/Micro are not offered in this mode, so they use prompt caching.
+LATENCY_OPTIMIZED_MODELS = frozenset(
+    {
+        "us.amazon.nova-pro-v1:0",
+    }
+)
+
+# Models that accept cachePoint blocks in the InvokeModel body.
+# Sending a cachePoint to any other model raises a ValidationException,
+# so callers never add one directly — _request_mode decides and
+# encode_nova_body places it.
+PROMPT_CACHE_MODELS = frozenset(
+    {
+        "us.amazon.nova-micro-v1:0",
+        "us.amazon.nova-lite-v1:0",
+        "us.amazon.nova-pro-v1:0",
+    }
+)
+
+_CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+# ```json ... ``` wrapper Nova sometimes puts around JSON answers
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+
+def _request_mode(model_id: str) -> tuple[bool, dict]:
+    """
+    Pick the request path for a model.
+    Returns (use_prompt_cache, extra invoke_model kwargs).
+    """
+    if LATENCY_OPTIMIZED and model_id in LATENCY_OPTIMIZED_MODELS:
+        return False, {"performanceConfigLatency": "optimized"}
+    return model_id in PROMPT_CACHE_MODELS, {}
+
+
+@lru_cache(maxsize=32)
+def _static_blocks(
+    system_prompt: str, static_instructions: Optional[str], cache: bool
+) -> tuple[tuple[dict, ...], tuple[dict, ...]]:
+    """
+    Prebuilt (system, leading user content) blocks for a prompt prefix.
+    Built once per distinct prefix and shared — callers must not mutate them.
+    """
+    system = [{"text": system_prompt}]
+    content = []
+    if static_instructions:
+        content.append({"text": static_instructions})
+        if cache:
+            content.append(_CACHE_POINT)
+    elif cache:
+        system.append(_CACHE_POINT)
+    return tuple(system), tuple(content)
+
+
+@lru_cache(maxsize=32)
+def _body_frame(
+    system_prompt: str,
+    static_instructions: Optional[str],
+    max_tokens: int,
+    temperature: float,
+    cache: bool,
+    tool_config: Optional[bytes] = None,
+) -> tuple[bytes, bytes]:
+    """
+    Serialized request body on either side of the per-incident user message.
+    Built once per prompt; encode_nova_body splices the message in between.
+    Carries a toolConfig when one is given (see nova_tool_config).
+    """
+    system, prefix = _static_blocks(system_prompt, static_instructions, cache)
+    head = (
+        b'{"messages":[{"role":"user","content":['
+        + b"".join(orjson.dumps(block) + b"," for block in prefix)
+        + b'{"text":'
+    )
+    tail = (
+        b'}]}],"system":'
+        + orjson.dumps(system)
+        + b',"inferenceConfig":'
+        + orjson.dumps({"maxTokens": max_tokens, "temperature": temperature})
+        + (b',"toolConfig":' + tool_config if tool_config else b"")
+        + b"}"
+    )
+    return head, tail
+
+
+def encode_nova_body(
+    system_prompt: str,
+    user_message: str,
+    max_tokens: int,
+    temperature: float,
+    static_instructions: Optional[str] = None,
+    cache: bool = False,
+    tool_config: Optional[bytes] = None,
+) -> bytes:
+    """
+    Serialized Nova InvokeModel request body.
+
+    static_instructions is the part of the user turn that never changes between
+    incidents. It is sent ahead of the per-incident user_message so the system
+    prompt + instructions form one byte-stable prefix, closed by a cachePoint
+    when cache is set. Only the user message is encoded per call — the rest is
+    spliced in from a cached frame.
+    """
+    head, tail = _body_frame(
+        system_prompt, static_instructions, max_tokens, temperature, cache, tool_config
+    )
+    return head + orjson.dumps(user_message) + tail
+
+
+def nova_tool_config(name: str, description: str, input_schema: dict) -> bytes:
+    """
+    Serialized toolConfig that forces Nova to answer by calling one tool, so
+    the reply arrives as a parsed object matching input_schema.
+    Build it once at import time and pass it to invoke_nova_tool.
+    """
+    return orjson.dumps(
+        {
+            "tools": [
+                {
+                    "toolSpec": {
+                        "name": name,
+                        "description": description,
+                        "inputSchema": {"json": input_schema},
+                    }
+                }
+            ],
+            "toolChoice": {"tool": {"name": name}},
+        }
+    )
+
+
+def _invoke(bedrock, model_id: str, body: bytes, invoke_options: dict) -> dict:
+    """InvokeModel and return the parsed response body. Logs token usage."""
+    response = bedrock.invoke_model(
+        modelId=model_id,
+        body=body,
+        contentType="application/json",
+        accept="application/json",
+        **invoke_options,
+    )
+
+    response_body = orjson.loads(response["body"].read())
+    usage = response_body.get("usage", {})
+    logger.debug(
+        f"[bedrock] {model_id} usage — in={usage.get('inputTokens')} "
+        f"out={usage.get('outputTokens')}"
+    )
+    if usage.get("cacheReadInputTokenCount"):
+        logger.info(
+            f"[bedrock] Prompt cache hit — "
+            f"{usage['cacheReadInputTokenCount']} cached input tokens"
+        )
+
+    return response_body
+
+
+def invoke_nova(
+    bedrock,
+    model_id: str,
+    system_prompt: str,
+    user_message: str,
+    max_tokens: int,
+    temperature: float,
+    static_instructions: Optional[str] = None,
+) -> str:
+    """Invoke a Nova model and return the stripped text of the first content block."""
+    cache, invoke_options = _request_mode(model_id)
+    body = encode_nova_body(
+        system_prompt,
+        user_message,
+        max_tokens,
+        temperature,
+        static_instructions=static_instructions,
+        cache=cache,
+    )
+
+    response_body = _invoke(bedrock, model_id, body, invoke_options)
+    return response_body["output"]["message"]["content"][0]["text"].strip()
+
+
+def invoke_nova_tool(
+    bedrock,
+    model_id: str,
+    system_prompt: str,
+    user_message: str,
+    tool_config: bytes,
+    max_tokens: int,
+    temperature: float,
+    static_instructions: Optional[str] = None,
+) -> dict:
+    """
+    Invoke a Nova model with a forced tool call (tool_config from
+    nova_tool_config) and return the tool input object.
+    If the model answers in text instead, that text is parsed as JSON.
+    """
+    cache, invoke_options = _request_mode(model_id)
+    body = encode_nova_body(
+        system_prompt,
+        user_message,
+        max_tokens,
+        temperature,
+        static_instructions=static_instructions,
+        cache=cache,
+        tool_config=tool_config,
+    )
+
+    response_body = _invoke(bedrock, model_id, body, invoke_options)
+    content = response_body["output"]["message"]["content"]
+    for block in content:
+        if "toolUse" in block:
+            return block["toolUse"]["input"]
+
+    text = "".join(block.get("text", "") for block in content)
+    return parse_json_text(text.strip())
+
+
+def stream_nova(
+    bedrock,
+    model_id: str,
+    system_prompt: str,
+    user_message: str,
+    max_tokens: int,
+    temperature: float,
+    static_instructions: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Invoke a Nova model with response streaming and yield text deltas as they
+    arrive. Same request body and routing as invoke_nova; the caller joins
+    (and strips) the pieces.
+    """
+    cache, invoke_options = _request_mode(model_id)
+    body = encode_nova_body(
+        system_prompt,
+        user_message,
+        max_tokens,
+        temperature,
+        static_instructions=static_instructions,
+        cache=cache,
+    )
+
+    response = bedrock.invoke_model_with_response_stream(
+        modelId=model_id,
+        body=body,
+        contentType="application/json",
+        accept="application/json",
+        **invoke_options,
+    )
+
+    stream = response["body"]
+    try:
+        for event in stream:
+            chunk = event.get("chunk")
+            if not chunk:
+                continue
+            payload = orjson.loads(chunk["bytes"])
+
+            delta = payload.get("contentBlockDelta")
+            if delta:
+                text = delta.get("delta", {}).get("text")
+                if text:
+                    yield text
+                continue
+
+            usage = payload.get("metadata", {}).get("usage", {})
+            if usage.get("cacheReadInputTokenCount"):
+                logger.info(
+                    f"[bedrock] Prompt cache hit — "
+                    f"{usage['cacheReadInputTokenCount']} cached input tokens"
+                )
+    finally:
+        # Callers may stop reading early — release the connection
+        stream.close()
+
+
+def parse_json_text(raw_text: str) -> dict:
+    """
+    Parse the JSON object out of a Nova text response.
+
+    Accepts a bare object or one wrapped in a ```json fence. If the model added
+    prose around the object, falls back to the outermost {...} span.
+    Raises ValueError when nothing parses.
+    """
+    if "```" in raw_text:
+        match = _JSON_FENCE_RE.search(raw_text)
+        if match:
+            raw_text = match.group(1)
+
+    try:
+        return orjson.loads(raw_text)
+    except orjson.JSONDecodeError:
+        start, end = raw_text.find("{"), raw_text.rfind("}")
+        if start == -1 or end <= start:
+            raise
+        return orjson.loads(raw_text[start : end + 1])
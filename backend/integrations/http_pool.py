@@ -0,0 +1,21 @@
+"""
+Shared HTTP connection pool for outbound calls (Slack webhooks, GitHub API).
+
+urllib.request opens a new TCP + TLS connection for every request. A single
+urllib3 PoolManager keeps connections to hooks.slack.com and api.github.com
+alive between incidents, so only the first call per host pays the handshake.
+
+urllib3 does not raise on 4xx/5xx — callers check resp.status themselves.
+"""
+
+from __future__ import annotations
+
+import urllib3
+
+# Retries cover connection errors and idempotent methods only (urllib3 never
+# retries a POST by default), so a Slack brief is never double-posted.
+HTTP = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=10,
+    retries=urllib3.Retry(total=2, backoff_factor=0.2),
+)
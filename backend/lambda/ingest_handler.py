@@ -14,40 +14,82 @@ from __future__ import annotations
 import json
 import logging
 import os
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Not in requirements — the Lambda runtime ships urllib3 alongside botocore
+import urllib3
+
+# The function asset is this directory only, with no bundled dependencies.
+# Use orjson when a layer provides it; stdlib json otherwise. orjson's
+# JSONDecodeError subclasses json's, so the except clauses cover both.
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 ORCHESTRATOR_URL = os.environ.get("ORCHESTRATOR_URL", "http://localhost:8000")
 
+# Module scope survives between invocations of a warm container, so the
+# connection to the ALB is reused instead of re-opened for every alarm.
+# urllib3 never retries a POST that was sent, so an alarm is not relayed twice.
+_POOL = urllib3.PoolManager(
+    num_pools=4,
+    maxsize=10,
+    retries=urllib3.Retry(total=2, backoff_factor=0.2),
+    # /api/ingest answers once the incident row is written; it does not
+    # wait for the pipeline, so a long read timeout only bills idle time
+    timeout=urllib3.Timeout(connect=2, read=10),
+)
+
+# Matches the SQS batch_size (set in CDK) and the pool's maxsize
+MAX_PARALLEL_RECORDS = 10
+_executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_RECORDS)
+
 
 def handler(event, context):
     """
     SQS event handler. Each record is one CloudWatch alarm.
-    Batch size is 1 (set in CDK) so we always get exactly one record.
+    A batch holds up to 10 records (set in CDK); they are relayed in parallel
+    and only the ones that failed are reported back for redelivery.
     """
-    logger.info(f"[ingest_handler] Received {len(event.get('Records', []))} records")
+    records = event.get("Records", [])
+    logger.info(f"[ingest_handler] Received {len(records)} records")
 
-    failed_items = []
+    failed = _executor.map(_process_record, records)
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": message_id} for message_id in failed if message_id
+        ]
+    }
 
-    for record in event.get("Records", []):
-        message_id = record.get("messageId", "unknown")
-        try:
-            # Parse SQS → SNS → CloudWatch alarm payload
-            alarm_payload = _parse_record(record)
-            logger.info(
-                f"[ingest_handler] Parsed alarm: {alarm_payload.get('AlarmName', 'unknown')}"
-            )
 
-            # Forward to Fargate — it creates the incident and runs the full pipeline
-            _trigger_orchestrator(alarm_payload)
+def _process_record(record: dict) -> str | None:
+    """Relay one record. Returns its messageId if it failed, else None."""
+    message_id = record.get("messageId", "unknown")
+    try:
+        # Parse SQS → SNS → CloudWatch alarm payload
+        alarm_payload = _parse_record(record)
+        logger.info(
+            f"[ingest_handler] Parsed alarm: {alarm_payload.get('AlarmName', 'unknown')}"
+        )
 
-        except Exception as e:
-            logger.error(f"[ingest_handler] Failed to process record {message_id}: {e}")
-            failed_items.append({"itemIdentifier": message_id})
+        # Forward to Fargate — it creates the incident and runs the full pipeline
+        _trigger_orchestrator(alarm_payload)
+        return None
 
-    return {"batchItemFailures": failed_items}
+    except Exception as e:
+        logger.error(f"[ingest_handler] Failed to process record {message_id}: {e}")
+        return message_id
 
 
 def _parse_record(record: dict) -> dict:
@@ -60,7 +102,7 @@ def _parse_record(record: dict) -> dict:
     body_str = record.get("body", "{}")
 
     try:
-        body = json.loads(body_str)
+        body = _loads(body_str)
     except json.JSONDecodeError:
         logger.warning("[ingest_handler] Body is not JSON — treating as raw string")
         return {"raw": body_str}
@@ -68,7 +110,7 @@ def _parse_record(record: dict) -> dict:
     # SNS envelope wrapping (raw_message_delivery=False)
     if "Message" in body and "Type" in body:
         try:
-            return json.loads(body["Message"])
+            return _loads(body["Message"])
         except (json.JSONDecodeError, KeyError):
             return body
 
@@ -83,25 +125,25 @@ def _trigger_orchestrator(alarm_payload: dict) -> None:
     Falls back gracefully if unreachable.
     """
     url = f"{ORCHESTRATOR_URL}/api/ingest"
-    payload = json.dumps(
+    payload = _dumps(
         {
             "alert_payload": alarm_payload,
             "alert_source": "CloudWatch",
         }
-    ).encode("utf-8")
+    )
 
     try:
-        req = urllib.request.Request(
+        resp = _POOL.request(
+            "POST",
             url,
-            data=payload,
+            body=payload,
             headers={"Content-Type": "application/json"},
-            method="POST",
         )
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            body = resp.read().decode()
-            logger.info(
-                f"[ingest_handler] Orchestrator accepted: {resp.status} — {body}"
-            )
+        body = resp.data.decode()
+        # urllib3 doesn't raise on HTTP errors — fail the record so SQS retries
+        if resp.status >= 400:
+            raise RuntimeError(f"orchestrator returned {resp.status}: {body}")
+        logger.info(f"[ingest_handler] Orchestrator accepted: {resp.status} — {body}")
     except Exception as e:
         logger.error(f"[ingest_handler] Could not reach orchestrator: {e}")
         raise  # Re-raise so SQS retries
@@ -13,9 +13,10 @@ from typing import Optional
 from decimal import Decimal
 from typing import Any
 
-import boto3
 from boto3.dynamodb.conditions import Key
 
+from backend.integrations.aws import dynamodb
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Enums
 # ─────────────────────────────────────────────────────────────────────────────
@@ -48,12 +49,24 @@ class AlertSource(str, Enum):
 
 TABLE_NAME = os.environ.get("INCIDENTS_TABLE", "incidentiq-incidents")
 
+# GSI behind the dashboard's recent-incidents list: every incident carries the
+# same partition_bucket, sorted by created_at. Incident volume is far below a
+# single partition's write limit, so one bucket keeps "latest N" a single Query.
+# Incidents older than the index get the attribute from
+# scripts/backfill_recent_index.py.
+RECENT_INDEX = "created_at-index"
+RECENT_BUCKET = "ALL"
+
+
+_table = None
+
 
 def _get_table():
-    dynamodb = boto3.resource(
-        "dynamodb", region_name=os.environ.get("AWS_REGION", "us-east-1")
-    )
-    return dynamodb.Table(TABLE_NAME)
+    # Every agent reads and writes through this — build the Table wrapper once
+    global _table
+    if _table is None:
+        _table = dynamodb().Table(TABLE_NAME)
+    return _table
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -65,20 +78,67 @@ def _now() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _contains_float(obj: Any) -> bool:
+    """True if a float appears anywhere in a dict/list structure."""
+    stack = [obj]
+    pop, push, _isinstance = stack.pop, stack.extend, isinstance
+    while stack:
+        value = pop()
+        if _isinstance(value, float):
+            return True
+        if _isinstance(value, dict):
+            push(value.values())
+        elif _isinstance(value, list):
+            push(value)
+    return False
+
+
 def _convert_floats_to_decimal(obj: Any) -> Any:
     """
     Recursively convert Python floats in a structure to Decimal objects,
     because DynamoDB (via boto3) requires Decimal for non-int numeric types.
+
+    Most writes (alert payloads, log entries) hold no floats at all — those
+    are returned as-is after one scan, without copying. Inputs are never
+    modified in place; callers pass shared/cached structures.
     """
+    if not _contains_float(obj):
+        return obj
+    return _floats_to_decimal(obj)
+
+
+def _floats_to_decimal(obj: Any) -> Any:
     if isinstance(obj, float):
         return Decimal(str(obj))
     if isinstance(obj, dict):
-        return {k: _convert_floats_to_decimal(v) for k, v in obj.items()}
+        return {k: _floats_to_decimal(v) for k, v in obj.items()}
     if isinstance(obj, list):
-        return [_convert_floats_to_decimal(v) for v in obj]
+        return [_floats_to_decimal(v) for v in obj]
     return obj
 
 
+def _build_set_clauses(updates: dict) -> tuple[list[str], dict, dict]:
+    """
+    Build SET clauses for an UpdateExpression from a field → value dict.
+    Returns (clauses, ExpressionAttributeNames, ExpressionAttributeValues).
+    """
+    # Convert any floats in update values to Decimal
+    updates = _convert_floats_to_decimal(updates)
+
+    set_expressions = []
+    expression_values = {}
+    expression_names = {}
+
+    for key, value in updates.items():
+        safe_key = f"#f_{key}"
+        val_key = f":v_{key}"
+        set_expressions.append(f"{safe_key} = {val_key}")
+        expression_names[safe_key] = key
+        expression_values[val_key] = value
+
+    return set_expressions, expression_names, expression_values
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Incident CRUD helpers
 # ─────────────────────────────────────────────────────────────────────────────
@@ -89,22 +149,25 @@ def create_incident(
     alert_source: str = "CloudWatch",
     repo_id: str = None,
     slack_webhook_url: str = None,
+    incident_id: Optional[str] = None,
 ) -> str:
     """
     Create a new incident record.
-    Returns the incident_id.
+    Returns the incident_id — generated here unless the caller pre-assigned one
+    (e.g. to return it before the write happens).
 
     New fields vs V1:
       repo_id           — which connected repo triggered this (e.g. "HimJar911/payments-service")
       slack_webhook_url — per-repo Slack webhook (overrides global secret)
     """
-    incident_id = str(uuid.uuid4())
+    incident_id = incident_id or str(uuid.uuid4())
     now = _now()
 
     item = {
         "incident_id": incident_id,
         "status": IncidentStatus.INGESTED.value,
         "created_at": now,
+        "partition_bucket": RECENT_BUCKET,
         "alert_source": alert_source,
         "alert_payload": alert_payload,
         "alert_payload_s3_path": None,
@@ -125,13 +188,22 @@ def create_incident(
     }
 
     item = _convert_floats_to_decimal(item)
-    _get_table().put_item(Item=item)
+    # Never overwrite an existing record — every incident keeps the created_at
+    # (and partition_bucket) its first write gave it
+    _get_table().put_item(
+        Item=item, ConditionExpression="attribute_not_exists(incident_id)"
+    )
     return incident_id
 
 
-def get_incident(incident_id: str) -> dict:
-    """Fetch the full incident object."""
-    response = _get_table().get_item(Key={"incident_id": incident_id})
+def get_incident(incident_id: str, consistent: bool = False) -> dict:
+    """
+    Fetch the full incident object.
+    consistent=True reads after the latest write (twice the read cost).
+    """
+    response = _get_table().get_item(
+        Key={"incident_id": incident_id}, ConsistentRead=consistent
+    )
     item = response.get("Item")
     if not item:
         raise ValueError(f"Incident not found: {incident_id}")
@@ -146,20 +218,7 @@ def update_incident(incident_id: str, updates: dict) -> None:
     if not updates:
         return
 
-    # Convert any floats in update values to Decimal
-    updates = _convert_floats_to_decimal(updates)
-
-    # Build UpdateExpression dynamically
-    set_expressions = []
-    expression_values = {}
-    expression_names = {}
-
-    for key, value in updates.items():
-        safe_key = f"#f_{key}"
-        val_key = f":v_{key}"
-        set_expressions.append(f"{safe_key} = {val_key}")
-        expression_names[safe_key] = key
-        expression_values[val_key] = value
+    set_expressions, expression_names, expression_values = _build_set_clauses(updates)
 
     _get_table().update_item(
         Key={"incident_id": incident_id},
@@ -169,6 +228,17 @@ def update_incident(incident_id: str, updates: dict) -> None:
     )
 
 
+def action_log_entry(agent: str, action_type: str, details: dict) -> dict:
+    """Build an actions_log entry, timestamped now."""
+    return {
+        "ts": _now(),
+        "agent": agent,
+        "action_type": action_type,
+        # Convert floats inside details to Decimal
+        "details": _convert_floats_to_decimal(details),
+    }
+
+
 def append_action_log(
     incident_id: str, agent: str, action_type: str, details: dict
 ) -> None:
@@ -176,15 +246,7 @@ def append_action_log(
     Append an entry to the actions_log list.
     This is the append-only audit trail that feeds the Postmortem Agent.
     """
-    # Convert floats inside details to Decimal
-    details = _convert_floats_to_decimal(details)
-
-    entry = {
-        "ts": _now(),
-        "agent": agent,
-        "action_type": action_type,
-        "details": details,
-    }
+    entry = action_log_entry(agent, action_type, details)
 
     _get_table().update_item(
         Key={"incident_id": incident_id},
@@ -196,14 +258,48 @@ def append_action_log(
     )
 
 
-def set_status(incident_id: str, status: IncidentStatus) -> None:
-    """Transition incident status and log the transition."""
-    update_incident(incident_id, {"status": status.value})
-    append_action_log(
+def update_and_append(incident_id: str, updates: dict, *entries: dict) -> None:
+    """
+    Apply field updates and append actions_log entries in one UpdateItem.
+    Same effect as update_incident + append_action_log, one round-trip.
+    Build entries with action_log_entry().
+    """
+    set_expressions, expression_names, expression_values = _build_set_clauses(updates)
+    if entries:
+        set_expressions.append(
+            "actions_log = list_append(if_not_exists(actions_log, :empty), :entries)"
+        )
+        expression_values[":entries"] = list(entries)
+        expression_values[":empty"] = []
+
+    if not set_expressions:
+        return
+
+    kwargs = {}
+    if expression_names:
+        kwargs["ExpressionAttributeNames"] = expression_names
+
+    _get_table().update_item(
+        Key={"incident_id": incident_id},
+        UpdateExpression="SET " + ", ".join(set_expressions),
+        ExpressionAttributeValues=expression_values,
+        **kwargs,
+    )
+
+
+def set_status(incident_id: str, status: IncidentStatus, *entries: dict) -> None:
+    """
+    Transition incident status and log the transition, in one UpdateItem.
+    Any extra actions_log entries (action_log_entry()) are appended ahead of
+    the transition — use it for the event that caused it.
+    """
+    update_and_append(
         incident_id,
-        agent="orchestrator",
-        action_type="status_transition",
-        details={"new_status": status.value},
+        {"status": status.value},
+        *entries,
+        action_log_entry(
+            "orchestrator", "status_transition", {"new_status": status.value}
+        ),
     )
 
 
@@ -217,20 +313,19 @@ def resolve_incident(incident_id: str, extra_fields: dict = None) -> None:
     if extra_fields:
         fields.update(extra_fields)
 
-    update_incident(incident_id, fields)
-    append_action_log(
+    update_and_append(
         incident_id,
-        agent="api",
-        action_type="incident_resolved",
-        details={"resolved_at": now},
+        fields,
+        action_log_entry("api", "incident_resolved", {"resolved_at": now}),
     )
 
 
 def list_recent_incidents(limit: int = 20) -> list[dict]:
-    """List recent incidents for the dashboard. Scans by created_at desc."""
-    response = _get_table().scan(
+    """List recent incidents for the dashboard, newest first (RECENT_INDEX Query)."""
+    response = _get_table().query(
+        IndexName=RECENT_INDEX,
+        KeyConditionExpression=Key("partition_bucket").eq(RECENT_BUCKET),
+        ScanIndexForward=False,
         Limit=limit,
-        FilterExpression="attribute_exists(created_at)",
     )
-    items = response.get("Items", [])
-    return sorted(items, key=lambda x: x.get("created_at", ""), reverse=True)[:limit]
+    return response.get("Items", [])
@@ -13,18 +13,64 @@ New fields vs V1:
 from __future__ import annotations
 
 import os
+import time
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
 
-import boto3
+from backend.integrations.aws import dynamodb
 
 REPOS_TABLE = os.environ.get("REPOS_TABLE", "incidentiq-repos")
 AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
 
+# Repo configs are read by every agent on every incident but only change on
+# onboard / analysis / disconnect. Reads are served from memory for this long.
+# The cache is per process: a write made through this module drops the entry
+# in the process that made it, but other API workers (uvicorn --workers 2) and
+# the agents keep theirs until it expires.
+REPO_CONFIG_TTL_SECONDS = 300
+# Pushes from repos that aren't connected are cached as misses for a shorter
+# window, so a noisy unregistered repo costs one GetItem per window, not per push
+REPO_CONFIG_MISS_TTL_SECONDS = 30
+REPO_CONFIG_CACHE_MAX_ENTRIES = 1000
+
+_config_cache: dict[str, tuple[float, Optional[dict]]] = {}
+
+# Webhook hot path only needs "is this repo connected, and where do alerts go".
+# Kept apart from _config_cache so a push doesn't pull the whole record
+# (token, analysis lists) into memory. Hits and misses both use the short TTL
+# so a disconnect or Slack change made in another worker stops routing pushes
+# within seconds; the GetItem it costs is a small projection.
+REPO_SLACK_TARGET_TTL_SECONDS = 30
+# repo_id → (cached_at, (slack_webhook_url,) or None when not connected)
+_slack_cache: dict[str, tuple[float, Optional[tuple[Optional[str]]]]] = {}
+
+# Every repo config attribute except the github_token secret
+PUBLIC_REPO_FIELDS = (
+    "repo_id",
+    "github_url",
+    "slack_webhook_url",
+    "github_webhook_id",
+    "connected_at",
+    "incident_count",
+    "last_incident_at",
+    "service_dependencies",
+    "estimated_dau",
+    "tech_stack",
+    "runbooks_ingested",
+    "analysis_completed_at",
+    "analysis_status",
+)
+
+
+_table = None
+
 
 def _get_table():
-    dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
-    return dynamodb.Table(REPOS_TABLE)
+    global _table
+    if _table is None:
+        _table = dynamodb().Table(REPOS_TABLE)
+    return _table
 
 
 def _now() -> str:
@@ -64,6 +110,7 @@ def create_repo_config(
     }
 
     _get_table().put_item(Item=item)
+    _invalidate(repo_id)
     return item
 
 
@@ -91,6 +138,7 @@ def update_repo_analysis(repo_id: str, analysis_result: dict) -> None:
             ":status": "complete",
         },
     )
+    _invalidate(repo_id)
 
 
 def set_analysis_status(repo_id: str, status: str) -> None:
@@ -100,12 +148,59 @@ def set_analysis_status(repo_id: str, status: str) -> None:
         UpdateExpression="SET analysis_status = :status",
         ExpressionAttributeValues={":status": status},
     )
+    _invalidate(repo_id)
 
 
 def get_repo_config(repo_id: str) -> Optional[dict]:
-    """Fetch repo config by repo_id."""
+    """
+    Fetch repo config by repo_id.
+    Cached for REPO_CONFIG_TTL_SECONDS — treat the returned dict as read-only.
+    """
+    cached = _config_cache.get(repo_id)
+    now = time.monotonic()
+    if cached:
+        cached_at, item = cached
+        ttl = REPO_CONFIG_TTL_SECONDS if item else REPO_CONFIG_MISS_TTL_SECONDS
+        if now - cached_at < ttl:
+            return item
+
     response = _get_table().get_item(Key={"repo_id": repo_id})
-    return response.get("Item")
+    item = response.get("Item")
+    if (
+        repo_id not in _config_cache
+        and len(_config_cache) >= REPO_CONFIG_CACHE_MAX_ENTRIES
+    ):
+        # Oldest insert first — good enough for a TTL cache this size
+        _config_cache.pop(next(iter(_config_cache)), None)
+    _config_cache[repo_id] = (now, item)
+    return item
+
+
+def get_repo_slack_target(repo_id: str) -> Optional[tuple[Optional[str]]]:
+    """
+    (slack_webhook_url,) for a connected repo, None if it isn't connected.
+    Reads only repo_id + slack_webhook_url from DynamoDB and caches that pair.
+    """
+    cached = _slack_cache.get(repo_id)
+    now = time.monotonic()
+    if cached:
+        cached_at, target = cached
+        if now - cached_at < REPO_SLACK_TARGET_TTL_SECONDS:
+            return target
+
+    response = _get_table().get_item(
+        Key={"repo_id": repo_id},
+        ProjectionExpression="repo_id, slack_webhook_url",
+    )
+    item = response.get("Item")
+    target = (item.get("slack_webhook_url"),) if item else None
+    if (
+        repo_id not in _slack_cache
+        and len(_slack_cache) >= REPO_CONFIG_CACHE_MAX_ENTRIES
+    ):
+        _slack_cache.pop(next(iter(_slack_cache)), None)
+    _slack_cache[repo_id] = (now, target)
+    return target
 
 
 def get_repo_config_by_url(github_url: str) -> Optional[dict]:
@@ -114,9 +209,22 @@ def get_repo_config_by_url(github_url: str) -> Optional[dict]:
     return get_repo_config(repo_id)
 
 
-def list_repos() -> list[dict]:
-    """List all connected repos."""
-    response = _get_table().scan()
+def list_repos(include_token: bool = True) -> list[dict]:
+    """
+    List all connected repos.
+    include_token=False projects out github_token in the Scan itself, so the
+    secret never leaves DynamoDB (use it for anything user-facing).
+    """
+    kwargs = {}
+    if not include_token:
+        kwargs["ProjectionExpression"] = ", ".join(
+            f"#{field}" for field in PUBLIC_REPO_FIELDS
+        )
+        kwargs["ExpressionAttributeNames"] = {
+            f"#{field}": field for field in PUBLIC_REPO_FIELDS
+        }
+
+    response = _get_table().scan(**kwargs)
     items = response.get("Items", [])
     return sorted(items, key=lambda x: x.get("connected_at", ""), reverse=True)
 
@@ -124,6 +232,7 @@ def list_repos() -> list[dict]:
 def delete_repo_config(repo_id: str) -> None:
     """Remove a repo config."""
     _get_table().delete_item(Key={"repo_id": repo_id})
+    _invalidate(repo_id)
 
 
 def increment_incident_count(repo_id: str) -> None:
@@ -140,6 +249,9 @@ def increment_incident_count(repo_id: str) -> None:
             ":now": _now(),
         },
     )
+    # Deliberately not invalidated: nothing reads the counters through
+    # get_repo_config, and dropping the entry here would make the pipeline's
+    # own lookups miss on every incident
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -147,15 +259,22 @@ def increment_incident_count(repo_id: str) -> None:
 # ─────────────────────────────────────────────────────────────────────────────
 
 
+def _invalidate(repo_id: str) -> None:
+    """Drop a cached repo config after writing it."""
+    _config_cache.pop(repo_id, None)
+    _slack_cache.pop(repo_id, None)
+
+
+# Connected repos are a small, fixed set of URLs
+@lru_cache(maxsize=1024)
 def _url_to_repo_id(github_url: str) -> str:
     """
     Convert GitHub URL to repo_id.
     "https://github.com/HimJar911/payments-service" → "HimJar911/payments-service"
     """
     url = github_url.strip().rstrip("/")
-    if "github.com/" in url:
-        return url.split("github.com/")[-1]
-    return url
+    _, marker, repo_id = url.rpartition("github.com/")
+    return repo_id if marker else url
 
 
 def parse_webhook_repo_id(payload: dict) -> Optional[str]:
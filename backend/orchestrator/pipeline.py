@@ -2,7 +2,8 @@
 Strands Agents Orchestrator — dispatches all 5 sub-agents in correct order.
 
 Execution flow:
-  1. Triage Agent           (sequential — must complete first)
+  1. Triage Agent           (sequential — must complete first;
+                             Investigation's commit/diff fetch runs alongside)
   2. Investigation Agent    (parallel with Runbook Agent)
   3. Runbook Agent          (parallel with Investigation Agent)
   4. Communication Agent    (sequential — needs 1+2+3)
@@ -11,76 +12,108 @@ Execution flow:
 from __future__ import annotations
 
 import logging
+import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
 
 from backend.models.incident import (
     IncidentStatus,
+    action_log_entry,
     append_action_log,
     get_incident,
     set_status,
 )
 from backend.agents.triage_agent import run_triage
-from backend.agents.investigation_agent import run_investigation
+from backend.agents.investigation_agent import prefetch_commits, run_investigation
 from backend.agents.runbook_agent import run_runbook
 from backend.agents.communication_agent import run_communication
 from backend.agents.postmortem_agent import run_postmortem
 
 logger = logging.getLogger(__name__)
 
+# Shared across incidents — commit prefetch + the parallel agents.
+# Each running incident holds up to three of these threads at once, and the
+# API runs many incidents side by side (PIPELINE_WORKERS), so a handful of
+# workers would queue one incident's agents behind another's Bedrock calls.
+AGENT_WORKERS = int(os.environ.get("PIPELINE_AGENT_WORKERS", "32"))
+_executor = ThreadPoolExecutor(max_workers=AGENT_WORKERS, thread_name_prefix="agents")
 
-def run_incident_pipeline(incident_id: str) -> None:
+
+def run_incident_pipeline(incident_id: str, alert_payload: Optional[dict] = None,
+                          alert_source: Optional[str] = None,
+                          repo_id: Optional[str] = None) -> None:
     """
     Main orchestration entry point.
     Called by the ingest Lambda after writing the incident to DynamoDB.
     Runs agents 1–4 synchronously (with 2+3 in parallel).
     Agent 5 (Postmortem) is triggered separately on resolution.
+
+    The creator can hand over the alert it just wrote so triage doesn't
+    read the incident back and commit collection can start right away;
+    without it triage loads it from DynamoDB and investigation collects
+    commits itself.
     """
     logger.info(f"[orchestrator] Starting pipeline for incident {incident_id}")
 
     try:
+        # Commit collection + diff fetch only need the ingested payload, so the
+        # GitHub round-trips run while triage waits on Nova
+        commits_future = None
+        if alert_payload is not None and alert_source is not None:
+            commits_future = _executor.submit(prefetch_commits, alert_payload,
+                                              alert_source, repo_id)
+
         # ── Step 1: Triage ────────────────────────────────────────────────────
         logger.info(f"[orchestrator] Dispatching Triage Agent")
         set_status(incident_id, IncidentStatus.TRIAGED)
 
-        triage_result = run_triage(incident_id)
-        append_action_log(incident_id, "orchestrator", "agent_complete",
-                         {"agent": "triage", "result_summary": triage_result.get("triage_summary_snippet", "")})
+        triage_result = run_triage(incident_id, alert_payload=alert_payload,
+                                   alert_source=alert_source, repo_id=repo_id)
         logger.info(f"[orchestrator] Triage complete — severity={triage_result.get('severity')}")
 
         # ── Step 2+3: Investigation + Runbook (parallel) ──────────────────────
         logger.info(f"[orchestrator] Dispatching Investigation + Runbook Agents in parallel")
-        set_status(incident_id, IncidentStatus.INVESTIGATING)
+        # Triage completion and the status change go out as one write
+        set_status(incident_id, IncidentStatus.INVESTIGATING,
+                   action_log_entry("orchestrator", "agent_complete",
+                                    {"agent": "triage", "result_summary": triage_result.get("triage_summary_snippet", "")}))
+
+        # One read of the triaged incident, shared by the remaining agents.
+        # Strongly consistent so triage's write is always visible.
+        incident = get_incident(incident_id, consistent=True)
 
         investigation_result = {}
         runbook_result = {}
 
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            futures = {
-                executor.submit(run_investigation, incident_id): "investigation",
-                executor.submit(run_runbook, incident_id): "runbook",
-            }
-            for future in as_completed(futures):
-                agent_name = futures[future]
-                try:
-                    result = future.result()
-                    if agent_name == "investigation":
-                        investigation_result = result
-                    else:
-                        runbook_result = result
-                    append_action_log(incident_id, "orchestrator", "agent_complete",
-                                     {"agent": agent_name})
-                    logger.info(f"[orchestrator] {agent_name} agent complete")
-                except Exception as e:
-                    logger.error(f"[orchestrator] {agent_name} agent failed: {e}")
-                    append_action_log(incident_id, "orchestrator", "agent_error",
-                                     {"agent": agent_name, "error": str(e)})
+        futures = {
+            _executor.submit(_run_investigation_with_prefetch, incident_id, commits_future, incident): "investigation",
+            _executor.submit(run_runbook, incident_id, incident): "runbook",
+        }
+        for future in as_completed(futures):
+            agent_name = futures[future]
+            try:
+                result = future.result()
+                if agent_name == "investigation":
+                    investigation_result = result
+                else:
+                    runbook_result = result
+                append_action_log(incident_id, "orchestrator", "agent_complete",
+                                 {"agent": agent_name})
+                logger.info(f"[orchestrator] {agent_name} agent complete")
+            except Exception as e:
+                logger.error(f"[orchestrator] {agent_name} agent failed: {e}")
+                append_action_log(incident_id, "orchestrator", "agent_error",
+                                 {"agent": agent_name, "error": str(e)})
 
         # ── Step 4: Communication ─────────────────────────────────────────────
+        # Both agents have finished with the snapshot — fold in what they wrote
+        incident.update(investigation_result)
+        incident.update(runbook_result)
+
         logger.info(f"[orchestrator] Dispatching Communication Agent")
-        run_communication(incident_id)
-        set_status(incident_id, IncidentStatus.WAR_ROOM_POSTED)
-        append_action_log(incident_id, "orchestrator", "agent_complete",
-                         {"agent": "communication"})
+        run_communication(incident_id, incident)
+        set_status(incident_id, IncidentStatus.WAR_ROOM_POSTED,
+                   action_log_entry("orchestrator", "agent_complete", {"agent": "communication"}))
         logger.info(f"[orchestrator] Communication agent complete — Slack brief posted")
 
         logger.info(f"[orchestrator] Pipeline complete for incident {incident_id}")
@@ -91,6 +124,18 @@ def run_incident_pipeline(incident_id: str) -> None:
         raise
 
 
+def _run_investigation_with_prefetch(incident_id: str, commits_future,
+                                    incident: Optional[dict] = None) -> dict:
+    """Run the Investigation Agent on prefetched commits (collected itself if there are none)."""
+    commits = None
+    if commits_future is not None:
+        try:
+            commits = commits_future.result()
+        except Exception as e:
+            logger.warning(f"[orchestrator] Commit prefetch failed, investigation will refetch: {e}")
+    return run_investigation(incident_id, commits=commits, incident=incident)
+
+
 def run_postmortem_pipeline(incident_id: str) -> None:
     """
     Triggered when incident is marked resolved (via API /resolve endpoint).
@@ -100,9 +145,8 @@ def run_postmortem_pipeline(incident_id: str) -> None:
 
     try:
         run_postmortem(incident_id)
-        set_status(incident_id, IncidentStatus.POSTMORTEM_READY)
-        append_action_log(incident_id, "orchestrator", "agent_complete",
-                         {"agent": "postmortem"})
+        set_status(incident_id, IncidentStatus.POSTMORTEM_READY,
+                   action_log_entry("orchestrator", "agent_complete", {"agent": "postmortem"}))
         logger.info(f"[orchestrator] Postmortem complete for {incident_id}")
 
     except Exception as e:
@@ -89,6 +89,21 @@ class IncidentIQStack(cdk.Stack):
             projection_type=dynamodb.ProjectionType.ALL,
         )
 
+        # GSI for the dashboard's recent-incidents list (newest first).
+        # partition_bucket is the same constant on every incident.
+        self.incidents_table.add_global_secondary_index(
+            index_name="created_at-index",
+            partition_key=dynamodb.Attribute(
+                name="partition_bucket",
+                type=dynamodb.AttributeType.STRING,
+            ),
+            sort_key=dynamodb.Attribute(
+                name="created_at",
+                type=dynamodb.AttributeType.STRING,
+            ),
+            projection_type=dynamodb.ProjectionType.ALL,
+        )
+
         # ─────────────────────────────────────────────────────────────
         # SQS — Incident ingest queue with DLQ
         # ─────────────────────────────────────────────────────────────
@@ -103,7 +118,8 @@ class IncidentIQStack(cdk.Stack):
             self,
             "IncidentIngestQueue",
             queue_name="incidentiq-ingest",
-            visibility_timeout=Duration.minutes(15),
+            # AWS guidance: at least 6x the consuming function's timeout
+            visibility_timeout=Duration.minutes(6),
             retention_period=Duration.days(4),
             dead_letter_queue=sqs.DeadLetterQueue(
                 max_receive_count=3,
@@ -435,7 +451,9 @@ class IncidentIQStack(cdk.Stack):
             handler="ingest_handler.handler",
             code=lambda_.Code.from_asset("../backend/lambda"),
             role=self.lambda_role,
-            timeout=Duration.minutes(14),
+            # The relay only waits for /api/ingest to write the incident —
+            # the pipeline runs after that response
+            timeout=Duration.minutes(1),
             memory_size=512,
             vpc=self.vpc,
             vpc_subnets=ec2.SubnetSelection(
@@ -462,7 +480,9 @@ class IncidentIQStack(cdk.Stack):
         self.ingest_lambda.add_event_source(
             lambda_events.SqsEventSource(
                 self.ingest_queue,
-                batch_size=1,
+                # Alarm storms arrive together — relay up to 10 per invocation
+                batch_size=10,
+                max_batching_window=Duration.seconds(5),
                 report_batch_item_failures=True,
             )
         )
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Backfill partition_bucket on incidents written before the created_at-index GSI.
+
+/api/incidents reads from created_at-index, which only contains items that
+have a partition_bucket. Incidents created before that change don't, so they
+are missing from the dashboard until this has run once. Safe to re-run —
+items that already have the attribute are skipped.
+
+Run this once after deploying the CDK stack that adds created_at-index.
+
+Usage:
+    cd scripts
+    python backfill_recent_index.py
+"""
+import sys
+from pathlib import Path
+
+# Add parent to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv(Path(__file__).parent.parent / "backend" / ".env")
+
+from botocore.exceptions import ClientError
+
+from backend.models.incident import RECENT_BUCKET, TABLE_NAME, _get_table
+
+
+def backfill() -> int:
+    """Set partition_bucket on every incident that lacks it. Returns the count."""
+    table = _get_table()
+    scan_kwargs = {
+        "ProjectionExpression": "incident_id",
+        "FilterExpression": "attribute_not_exists(partition_bucket) AND attribute_exists(created_at)",
+    }
+    updated = 0
+
+    print(f"🔎 Scanning {TABLE_NAME} for incidents without partition_bucket")
+
+    while True:
+        response = table.scan(**scan_kwargs)
+        for item in response.get("Items", []):
+            try:
+                table.update_item(
+                    Key={"incident_id": item["incident_id"]},
+                    UpdateExpression="SET partition_bucket = :bucket",
+                    # Never resurrect an incident deleted mid-scan
+                    ConditionExpression="attribute_exists(incident_id)",
+                    ExpressionAttributeValues={":bucket": RECENT_BUCKET},
+                )
+                updated += 1
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                    raise
+
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            break
+        scan_kwargs["ExclusiveStartKey"] = last_key
+
+    return updated
+
+
+if __name__ == "__main__":
+    count = backfill()
+    print(f"\n✅ Backfilled partition_bucket on {count} incidents")